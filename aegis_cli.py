@@ -0,0 +1,138 @@
+import sys
+import os
+import argparse
+import importlib
+
+# Project root setup so 'strategy', 'scripts' and the top-level modules resolve.
+# Inserted first: when installed this is site-packages/aegis, and its 'scripts' /
+# 'strategy' must win over any unrelated top-level packages of the same name.
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# Subcommand -> module holding its implementation. Nothing here is imported until
+# the subcommand runs, so `aegis --help` and argument errors never pay for
+# torch / pandas / matplotlib.
+COMMAND_MODULES = {
+    "backtest": "scripts.backtester",
+    "stress": "scripts.stress_tester",
+    "optimize": "scripts.optimizer",
+    "montecarlo": "scripts.monte_carlo_test",
+    "train": "scripts.train_ai",
+    "download": "scripts.download_data",
+    "bench": "scripts.benchmark",
+}
+
+# Dataset used by backtest / optimize / train when no CSV is given (under the data dir)
+DEFAULT_CSV = "binance_BTC_USDT_1m.csv"
+
+
+def import_command(name):
+    """Imports the module behind a subcommand (what the startup benchmark times)."""
+    return importlib.import_module(COMMAND_MODULES[name])
+
+
+def _backtest(args, mod):
+    results_path = mod.run_real_backtest(args.csv, chunk_size=args.chunk_size, track_latency=args.latency)
+    if args.plot and os.path.exists(results_path):
+        from scripts.visualizer import plot_telemetry
+        plot_telemetry(results_path, out_file=args.plot_file)
+
+
+def _stress(args, mod):
+    mod.start_mega_test()
+
+
+def _optimize(args, mod):
+    mod.start_optimization(args.csv)
+
+
+def _montecarlo(args, mod):
+    prices, pnls, invs = mod.run_final_grand_simulation(steps=args.steps)
+    if args.plot:
+        mod.plot_simulation_report(prices, pnls, invs)
+
+
+def _train(args, mod):
+    mod.train_with_real_data(args.csv, epochs=args.epochs, batch_size=args.batch_size,
+                             num_workers=args.num_workers)
+
+
+def _download(args, mod):
+    if args.symbol is None:
+        mod.download_scenarios()
+    else:
+        mod.download_binance_data(args.symbol, args.timeframe, args.start, args.end, args.filename,
+                                  max_workers=args.workers)
+
+
+def _bench(args, mod):
+    return mod.main(args.bench_args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="aegis", description="Aegis-LOB command line")
+    parser.add_argument("--data-dir", help="datasets, models and caches (default: $AEGIS_DATA_DIR or ./data)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("backtest", help="stream a CSV through StoikovBot (scripts/backtester.py)")
+    p.add_argument("csv", nargs="?", help=f"default: <data dir>/{DEFAULT_CSV}")
+    p.add_argument("--chunk-size", type=int, default=100_000)
+    p.add_argument("--latency", action="store_true", help="per-stage latency histograms (dashboard + JSON export)")
+    p.add_argument("--no-plot", dest="plot", action="store_false", help="skip the telemetry report")
+    p.add_argument("--plot-file", help="save the report as an image instead of opening a window")
+    p.set_defaults(handler=_backtest)
+
+    p = sub.add_parser("stress", help="run the crash / moon / sideways regime scenarios")
+    p.set_defaults(handler=_stress)
+
+    p = sub.add_parser("optimize", help="grid-search gamma / sigma / alpha weight")
+    p.add_argument("csv", nargs="?", help=f"default: <data dir>/{DEFAULT_CSV}")
+    p.set_defaults(handler=_optimize)
+
+    p = sub.add_parser("montecarlo", help="synthetic GBM simulation with the live dashboard")
+    p.add_argument("--steps", type=int, default=10000)
+    p.add_argument("--plot", action="store_true", help="show the performance report afterwards")
+    p.set_defaults(handler=_montecarlo)
+
+    p = sub.add_parser("train", help="train the LSTM signal model")
+    p.add_argument("csv", nargs="?", help=f"default: <data dir>/{DEFAULT_CSV}")
+    p.add_argument("--epochs", type=int, default=50)
+    p.add_argument("--batch-size", type=int, default=512)
+    p.add_argument("--num-workers", type=int, default=None)
+    p.set_defaults(handler=_train)
+
+    p = sub.add_parser("download", help="download OHLCV from Binance (default: the three stress scenarios)")
+    p.add_argument("symbol", nargs="?", help="e.g. BTC/USDT")
+    p.add_argument("timeframe", nargs="?", default="1m")
+    p.add_argument("start", nargs="?", help="ISO-8601 start, e.g. 2024-08-05T00:00:00Z")
+    p.add_argument("end", nargs="?", help="ISO-8601 end")
+    p.add_argument("filename", nargs="?", help="output file under the data dir")
+    p.add_argument("--workers", type=int, default=4)
+    p.set_defaults(handler=_download)
+
+    p = sub.add_parser("bench", help="benchmark suite (arguments go to scripts/benchmark.py)")
+    p.add_argument("bench_args", nargs=argparse.REMAINDER)
+    p.set_defaults(handler=_bench)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    # Every subcommand resolves its data paths through data_stream.data_dir()
+    if args.data_dir:
+        os.environ["AEGIS_DATA_DIR"] = args.data_dir
+    if getattr(args, "csv", "") is None:
+        from data_stream import data_path
+        args.csv = data_path(DEFAULT_CSV)
+    if args.command == "download" and args.symbol is not None and not (args.start and args.end and args.filename):
+        parser.error("download: give symbol, timeframe, start, end and filename (or none for the scenarios)")
+    if args.command == "backtest" and not os.path.isfile(args.csv):
+        parser.error(f"backtest: CSV not found: {args.csv}")
+    result = args.handler(args, import_command(args.command))
+    return result if isinstance(result, int) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
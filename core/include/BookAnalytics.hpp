@@ -0,0 +1,110 @@
+#ifndef BOOKANALYTICS_HPP
+#define BOOKANALYTICS_HPP
+
+#include <cstddef>
+
+// Snapshot of book-derived signals, returned by OrderBook/LevelBook::getAnalytics().
+// Prices are 0.0 when the side they need is empty (same convention as getBestBid()).
+struct BookAnalytics {
+    double bestBid = 0.0;
+    double bestAsk = 0.0;
+    double bestBidQty = 0.0;
+    double bestAskQty = 0.0;
+    double mid = 0.0;
+    double spread = 0.0;
+    double imbalance = 0.0;        // (bidQty - askQty) / (bidQty + askQty) at the touch, in [-1, 1]
+    double microprice = 0.0;       // Touch prices weighted by the opposite side's quantity
+    double bidDepth = 0.0;         // Bid volume priced within depthBps of mid
+    double askDepth = 0.0;         // Ask volume priced within depthBps of mid
+    double depthImbalance = 0.0;   // Same as imbalance, over the depthBps band
+    double depthWeightedMid = 0.0; // Band VWAPs weighted by the opposite side's band depth
+    double vwapBuy = 0.0;          // Average price to buy fillQty by sweeping asks (0.0 if too thin)
+    double vwapSell = 0.0;         // Average price to sell fillQty by sweeping bids (0.0 if too thin)
+    double totalBidVolume = 0.0;
+    double totalAskVolume = 0.0;
+    size_t bidLevels = 0;
+    size_t askLevels = 0;
+};
+
+namespace analytics {
+
+// Walks levels best-first while they are inside the band; returns volume and fills sumPxQty.
+template <typename Levels, typename QtyOf>
+double bandDepth(const Levels& levels, QtyOf qtyOf, double mid, double band, double& sumPxQty) {
+    double depth = 0.0;
+    sumPxQty = 0.0;
+    for (const auto& level : levels) {
+        double dist = level.first > mid ? level.first - mid : mid - level.first;
+        if (dist > band) break;
+        double q = qtyOf(level.second);
+        depth += q;
+        sumPxQty += level.first * q;
+    }
+    return depth;
+}
+
+// Average execution price for fillQty against `levels`, or 0.0 if the side cannot fill it.
+template <typename Levels, typename QtyOf>
+double vwapToFill(const Levels& levels, QtyOf qtyOf, double fillQty) {
+    if (fillQty <= 0.0) return 0.0;
+    double remaining = fillQty;
+    double cost = 0.0;
+    for (const auto& level : levels) {
+        double take = qtyOf(level.second);
+        if (take > remaining) take = remaining;
+        cost += take * level.first;
+        remaining -= take;
+        if (remaining <= 0.0) return cost / fillQty;
+    }
+    return 0.0;
+}
+
+// Fills everything except the running totals, which the books maintain incrementally.
+// Touch, microprice, band depth and VWAPs are computed on demand on every call, not
+// maintained per update: depthBps and fillQty are per-call arguments and the band
+// moves with mid. The cost is bounded by the levels inside the band / needed for the
+// fill, so updates stay O(1) and callers pay only when they ask for analytics.
+template <typename Bids, typename Asks, typename QtyOf>
+BookAnalytics compute(const Bids& bids, const Asks& asks, QtyOf qtyOf, double depthBps, double fillQty) {
+    BookAnalytics a;
+    a.bidLevels = bids.size();
+    a.askLevels = asks.size();
+    if (!bids.empty()) {
+        a.bestBid = bids.begin()->first;
+        a.bestBidQty = qtyOf(bids.begin()->second);
+    }
+    if (!asks.empty()) {
+        a.bestAsk = asks.begin()->first;
+        a.bestAskQty = qtyOf(asks.begin()->second);
+    }
+    a.vwapBuy = vwapToFill(asks, qtyOf, fillQty);
+    a.vwapSell = vwapToFill(bids, qtyOf, fillQty);
+    if (bids.empty() || asks.empty()) return a;
+
+    a.mid = (a.bestBid + a.bestAsk) / 2.0;
+    a.spread = a.bestAsk - a.bestBid;
+    double touch = a.bestBidQty + a.bestAskQty;
+    if (touch > 0.0) {
+        a.imbalance = (a.bestBidQty - a.bestAskQty) / touch;
+        a.microprice = (a.bestBid * a.bestAskQty + a.bestAsk * a.bestBidQty) / touch;
+    }
+
+    double band = a.mid * depthBps * 1e-4;
+    double bidPxQty = 0.0, askPxQty = 0.0;
+    a.bidDepth = bandDepth(bids, qtyOf, a.mid, band, bidPxQty);
+    a.askDepth = bandDepth(asks, qtyOf, a.mid, band, askPxQty);
+    double depth = a.bidDepth + a.askDepth;
+    if (a.bidDepth > 0.0 && a.askDepth > 0.0) {
+        a.depthImbalance = (a.bidDepth - a.askDepth) / depth;
+        a.depthWeightedMid = ((bidPxQty / a.bidDepth) * a.askDepth + (askPxQty / a.askDepth) * a.bidDepth) / depth;
+    } else {
+        // Band narrower than the spread: fall back to the touch
+        a.depthImbalance = a.imbalance;
+        a.depthWeightedMid = a.microprice;
+    }
+    return a;
+}
+
+} // namespace analytics
+
+#endif
@@ -0,0 +1,74 @@
+#ifndef BOOKSTATS_HPP
+#define BOOKSTATS_HPP
+
+#include <cstdint>
+#include <cstddef>
+#include <chrono>
+#if defined(__x86_64__) || defined(_M_X64) || defined(__i386__) || defined(_M_IX86)
+#include <x86intrin.h>
+#define AEGIS_HAVE_RDTSC 1
+#else
+#define AEGIS_HAVE_RDTSC 0
+#endif
+
+// Cost samples for one operation type. Units are TSC cycles where rdtsc is
+// available and steady_clock nanoseconds elsewhere (see BookStats::cyclesAreTsc).
+struct OpCycleStats {
+    uint64_t samples = 0;
+    uint64_t total = 0;
+    uint64_t max = 0;
+
+    void record(uint64_t value) {
+        ++samples;
+        total += value;
+        if (value > max) max = value;
+    }
+
+    double mean() const { return samples ? static_cast<double>(total) / samples : 0.0; }
+};
+
+inline uint64_t readCycles() {
+#if AEGIS_HAVE_RDTSC
+    return __rdtsc();
+#else
+    return static_cast<uint64_t>(std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::steady_clock::now().time_since_epoch()).count());
+#endif
+}
+
+// Engine-side counters and gauges returned by OrderBook::getStats().
+// Counters accumulate until resetStats(); gauges describe the book right now.
+struct BookStats {
+    // --- Counters ---
+    uint64_t addsReceived = 0;     // Limit orders submitted (addOrder / ADD events)
+    uint64_t ordersRested = 0;     // Limit orders (or residuals) that ended up resting
+    uint64_t marketOrders = 0;     // IOC market orders submitted
+    uint64_t cancelsRequested = 0;
+    uint64_t cancelsUnknown = 0;   // Cancels for ids not resting (already filled / never seen)
+    uint64_t bulkCancels = 0;      // cancelSide / cancelRange / cancelOwner calls
+    uint64_t ordersBulkCancelled = 0;
+    uint64_t matches = 0;          // Individual resting-order fills
+    uint64_t matchedVolume = 0;
+    uint64_t levelsCreated = 0;
+    uint64_t levelsErased = 0;
+
+    // --- Gauges ---
+    size_t bidLevels = 0;
+    size_t askLevels = 0;
+    size_t restingOrders = 0;
+    size_t peakRestingOrders = 0;
+    size_t orderMapSize = 0;
+    size_t orderMapBuckets = 0;
+    size_t orderPriceMapSize = 0;
+    size_t orderPriceMapBuckets = 0;
+    size_t estimatedBytes = 0;     // Node + bucket estimate for the maps and order lists
+
+    // --- Sampled per-operation cost ---
+    uint32_t sampleEvery = 0;      // 0 = sampling off; N = time one of every N operations
+    bool cyclesAreTsc = AEGIS_HAVE_RDTSC;
+    OpCycleStats addCycles;
+    OpCycleStats cancelCycles;
+    OpCycleStats marketCycles;
+};
+
+#endif
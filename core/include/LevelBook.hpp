@@ -0,0 +1,123 @@
+#ifndef LEVELBOOK_HPP
+#define LEVELBOOK_HPP
+
+#include "Order.hpp"
+#include "BookAnalytics.hpp"
+#include <map>
+#include <algorithm>
+#include <functional>
+#include <vector>
+#include <utility>
+#include <cstddef>
+#include <cstdint>
+
+// Market-by-price (aggregated L2) book.
+// Each price level holds only its total quantity, so an L2 feed message
+// ("level 42,010.5 now has 3.2") maps to exactly one setLevel() call.
+class LevelBook {
+private:
+    // Same price ordering as OrderBook: best level is always begin()
+    std::map<double, double> asks;
+    std::map<double, double, std::greater<double>> bids;
+    uint64_t updateCount = 0;
+    double bidVolume = 0.0;
+    double askVolume = 0.0;
+
+    // Single lookup per update: lower_bound doubles as the insertion hint.
+    // Returns the change in the side's total volume.
+    template <typename Levels>
+    static double apply(Levels& levels, double price, double qty) {
+        auto it = levels.lower_bound(price);
+        bool exists = (it != levels.end() && it->first == price);
+        double before = exists ? it->second : 0.0;
+        if (qty > 0.0) {
+            if (exists) it->second = qty;
+            else levels.emplace_hint(it, price, qty);
+            return qty - before;
+        }
+        if (exists) levels.erase(it);
+        return -before;
+    }
+
+    template <typename Levels>
+    static std::vector<std::pair<double, double>> depth(const Levels& levels, size_t maxLevels) {
+        std::vector<std::pair<double, double>> out;
+        out.reserve(std::min(maxLevels, levels.size()));
+        for (auto it = levels.begin(); it != levels.end() && out.size() < maxLevels; ++it) {
+            out.emplace_back(it->first, it->second);
+        }
+        return out;
+    }
+
+public:
+    // Sets the absolute quantity at a price level. qty <= 0 removes the level.
+    void setLevel(Side side, double price, double qty) {
+        if (side == Side::BUY) bidVolume += apply(bids, price, qty);
+        else askVolume += apply(asks, price, qty);
+        ++updateCount;
+    }
+
+    // Batched setLevel over raw arrays. sides[i] uses the Side encoding (0 = BUY, 1 = SELL).
+    void applyUpdates(const int8_t* sides, const double* prices, const double* qtys, size_t n) {
+        for (size_t i = 0; i < n; ++i) {
+            if (sides[i] == static_cast<int8_t>(Side::BUY)) bidVolume += apply(bids, prices[i], qtys[i]);
+            else askVolume += apply(asks, prices[i], qtys[i]);
+        }
+        updateCount += n;
+    }
+
+    void clear() {
+        bids.clear();
+        asks.clear();
+        bidVolume = askVolume = 0.0;
+    }
+
+    double getBestBid() const {
+        if (bids.empty()) return 0.0;
+        return bids.begin()->first;
+    }
+
+    double getBestAsk() const {
+        if (asks.empty()) return 0.0;
+        return asks.begin()->first;
+    }
+
+    double getBestBidQty() const {
+        if (bids.empty()) return 0.0;
+        return bids.begin()->second;
+    }
+
+    double getBestAskQty() const {
+        if (asks.empty()) return 0.0;
+        return asks.begin()->second;
+    }
+
+    double getMidPrice() const {
+        double bb = getBestBid();
+        double ba = getBestAsk();
+        if (bb == 0.0 || ba == 0.0) return 0.0;
+        return (bb + ba) / 2.0;
+    }
+
+    // Top maxLevels (price, qty) pairs of one side, best first.
+    std::vector<std::pair<double, double>> getDepth(Side side, size_t maxLevels) const {
+        if (side == Side::BUY) return depth(bids, maxLevels);
+        return depth(asks, maxLevels);
+    }
+
+    // Same signals as OrderBook::getAnalytics(), over aggregated levels.
+    BookAnalytics getAnalytics(double depthBps, double fillQty) const {
+        BookAnalytics a = analytics::compute(bids, asks, [](double qty) { return qty; }, depthBps, fillQty);
+        a.totalBidVolume = bidVolume;
+        a.totalAskVolume = askVolume;
+        return a;
+    }
+
+    size_t levelCount(Side side) const {
+        return side == Side::BUY ? bids.size() : asks.size();
+    }
+
+    uint64_t getUpdateCount() const { return updateCount; }
+};
+
+#endif
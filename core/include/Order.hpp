@@ -1,3 +1,6 @@
+#ifndef ORDER_HPP
+#define ORDER_HPP
+
 #include <iostream>
 #include <string>
 
@@ -9,8 +12,11 @@ struct Order {
     uint32_t quantity; 
     Side side;       
     uint64_t timestamp;
+    uint32_t owner;    // Strategy / owner tag for bulk cancels (0 = untagged)
 
     // Constructor
-    Order(uint64_t _id, double _p, uint32_t _q, Side _s, uint64_t _t)
-        : id(_id), price(_p), quantity(_q), side(_s), timestamp(_t) {}
-};
\ No newline at end of file
+    Order(uint64_t _id, double _p, uint32_t _q, Side _s, uint64_t _t, uint32_t _owner = 0)
+        : id(_id), price(_p), quantity(_q), side(_s), timestamp(_t), owner(_owner) {}
+};
+
+#endif
\ No newline at end of file
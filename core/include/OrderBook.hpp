@@ -2,11 +2,29 @@
 #define ORDERBOOK_HPP
 
 #include "Limit.hpp"
+#include "BookAnalytics.hpp"
+#include "BookStats.hpp"
 #include <map>
 #include <unordered_map>
+#include <unordered_set>
 #include <functional>
 #include <iostream>
 #include <list>
+#include <vector>
+#include <utility>
+#include <limits>
+#include <cstdint>
+#include <cstddef>
+
+// Orders removed by a bulk cancel. Side and range sweeps list them in book order
+// (best level first, FIFO within a level); owner cancels in no particular order.
+struct CancelResult {
+    std::vector<uint64_t> ids;
+    std::vector<uint32_t> quantities;
+};
+
+// Event kinds for OrderBook::applyEvents (mirrored by scripts/hawkes_generator.py)
+enum class EventKind : int8_t { ADD = 0, CANCEL = 1, MARKET = 2 };
 
 class OrderBook {
 private:
@@ -21,6 +39,32 @@ private:
     std::unordered_map<uint64_t, std::list<Order>::iterator> orderMap;
     std::unordered_map<uint64_t, double> orderPriceMap; // Necessary to know which price level to delete from
 
+    // Resting volume per side, adjusted alongside Limit::totalVolume on add/cancel/match
+    uint64_t bidVolume = 0;
+    uint64_t askVolume = 0;
+
+    // Resting ids per non-zero owner tag, so cancelOwner() touches only that
+    // owner's orders instead of walking the whole book
+    std::unordered_map<uint32_t, std::unordered_set<uint64_t>> ownerOrders;
+
+    // Per-trade / per-cancel console output; switched off for high-rate replays
+    bool logging = true;
+
+    // Always-on counters (a few integer increments per operation) plus optional
+    // sampled cycle timing; gauges are filled in by getStats()
+    BookStats stats;
+    uint32_t sampleTick = 0;
+
+    template <typename F>
+    auto sampled(OpCycleStats& op, F&& fn) -> decltype(fn()) {
+        if (stats.sampleEvery == 0 || ++sampleTick < stats.sampleEvery) return fn();
+        sampleTick = 0;
+        uint64_t start = readCycles();
+        auto result = fn();
+        op.record(readCycles() - start);
+        return result;
+    }
+
 public:
     double getBestBid() const {
         if (bids.empty()) return 0.0;
@@ -39,37 +83,259 @@ public:
         return (bb + ba) / 2.0;
     }
 
-    void addOrder(Order order) {
-        if (order.side == Side::BUY) {
-            handleBuyOrder(order);
+    // Remaining quantity of a resting order; 0 once it has fully traded or been cancelled.
+    uint32_t getOrderQuantity(uint64_t orderId) const {
+        auto it = orderMap.find(orderId);
+        return it == orderMap.end() ? 0 : it->second->quantity;
+    }
+
+    // Top maxLevels (price, totalVolume) pairs of one side, best first (same shape as LevelBook).
+    std::vector<std::pair<double, double>> getDepth(Side side, size_t maxLevels) const {
+        std::vector<std::pair<double, double>> out;
+        if (side == Side::BUY) {
+            for (auto it = bids.begin(); it != bids.end() && out.size() < maxLevels; ++it)
+                out.emplace_back(it->first, it->second.totalVolume);
         } else {
-            handleSellOrder(order);
+            for (auto it = asks.begin(); it != asks.end() && out.size() < maxLevels; ++it)
+                out.emplace_back(it->first, it->second.totalVolume);
+        }
+        return out;
+    }
+
+    // All book signals in one pass over the touch and the depthBps band around mid,
+    // computed on demand per call (see analytics::compute); only the totals are cached.
+    BookAnalytics getAnalytics(double depthBps, double fillQty) const {
+        auto qtyOf = [](const Limit& limit) { return static_cast<double>(limit.totalVolume); };
+        BookAnalytics a = analytics::compute(bids, asks, qtyOf, depthBps, fillQty);
+        a.totalBidVolume = static_cast<double>(bidVolume);
+        a.totalAskVolume = static_cast<double>(askVolume);
+        return a;
+    }
+
+    void setLogging(bool enabled) { logging = enabled; }
+
+    // Counters and gauges in one snapshot (see BookStats.hpp).
+    BookStats getStats() const {
+        BookStats out = stats;
+        out.bidLevels = bids.size();
+        out.askLevels = asks.size();
+        out.restingOrders = orderMap.size();
+        out.orderMapSize = orderMap.size();
+        out.orderMapBuckets = orderMap.bucket_count();
+        out.orderPriceMapSize = orderPriceMap.size();
+        out.orderPriceMapBuckets = orderPriceMap.bucket_count();
+
+        // List nodes carry two links; map nodes three links and a color word;
+        // unordered_map nodes one link, plus one pointer per bucket.
+        const size_t ptr = sizeof(void*);
+        size_t levels = bids.size() + asks.size();
+        out.estimatedBytes = orderMap.size() * (sizeof(Order) + 2 * ptr)
+            + levels * (sizeof(std::pair<const double, Limit>) + 4 * ptr)
+            + orderMap.bucket_count() * ptr
+            + orderMap.size() * (sizeof(std::pair<const uint64_t, std::list<Order>::iterator>) + ptr)
+            + orderPriceMap.bucket_count() * ptr
+            + orderPriceMap.size() * (sizeof(std::pair<const uint64_t, double>) + ptr);
+        for (const auto& owner : ownerOrders) {
+            out.estimatedBytes += owner.second.bucket_count() * ptr + owner.second.size() * (sizeof(uint64_t) + ptr);
         }
+        return out;
+    }
+
+    // Zeroes the counters and cycle samples; the sampling rate is kept.
+    void resetStats() {
+        uint32_t every = stats.sampleEvery;
+        stats = BookStats();
+        stats.sampleEvery = every;
+        stats.peakRestingOrders = orderMap.size();
+        sampleTick = 0;
+    }
+
+    // Times one of every `every` add / cancel / market operations (0 disables).
+    void setCycleSampling(uint32_t every) {
+        stats.sampleEvery = every;
+        sampleTick = 0;
+    }
+
+    void addOrder(Order order) {
+        submitLimit(order);
+    }
+
+    // Immediate-or-cancel market order: sweeps the opposite side and never rests.
+    // Returns the executed quantity.
+    uint32_t marketOrder(uint64_t orderId, Side side, uint32_t quantity, uint64_t timestamp) {
+        ++stats.marketOrders;
+        return sampled(stats.marketCycles, [&]() {
+            if (side == Side::BUY) {
+                return handleBuyOrder(Order(orderId, std::numeric_limits<double>::max(), quantity, side, timestamp), false);
+            }
+            return handleSellOrder(Order(orderId, std::numeric_limits<double>::lowest(), quantity, side, timestamp), false);
+        });
+    }
+
+    // Replays a mixed add / cancel / market stream in order (kinds use EventKind,
+    // sides use Side). Returns the total quantity executed by the stream.
+    uint64_t applyEvents(const int8_t* kinds, const int8_t* sides, const uint64_t* ids, const double* prices,
+                         const uint32_t* quantities, const int64_t* timestamps, size_t n) {
+        uint64_t executed = 0;
+        for (size_t i = 0; i < n; ++i) {
+            Side side = sides[i] == static_cast<int8_t>(Side::BUY) ? Side::BUY : Side::SELL;
+            uint64_t ts = static_cast<uint64_t>(timestamps[i]);
+            switch (static_cast<EventKind>(kinds[i])) {
+                case EventKind::ADD: {
+                    executed += submitLimit(Order(ids[i], prices[i], quantities[i], side, ts));
+                    break;
+                }
+                case EventKind::CANCEL:
+                    cancelOrder(ids[i]);
+                    break;
+                case EventKind::MARKET:
+                    executed += marketOrder(ids[i], side, quantities[i], ts);
+                    break;
+            }
+        }
+        return executed;
     }
 
     // Cancel an order by its unique ID
     // Uses the orderMap to perform the operation in O(1) time complexity.
     void cancelOrder(uint64_t orderId) {
-        if (orderMap.find(orderId) == orderMap.end()) return;
+        ++stats.cancelsRequested;
+        if (!sampled(stats.cancelCycles, [&]() { return cancelResting(orderId); })) ++stats.cancelsUnknown;
+    }
+
+    // --- Bulk cancels: no Python loop, one console line, ids + quantities returned ---
+
+    // Every resting order on one side.
+    CancelResult cancelSide(Side side) {
+        CancelResult out;
+        if (side == Side::BUY) sweepLevels(bids, bids.begin(), bids.end(), bidVolume, out);
+        else sweepLevels(asks, asks.begin(), asks.end(), askVolume, out);
+        finishBulk(out);
+        return out;
+    }
+
+    // Every resting order on one side priced within [minPrice, maxPrice].
+    CancelResult cancelRange(Side side, double minPrice, double maxPrice) {
+        CancelResult out;
+        if (minPrice <= maxPrice) {
+            // Bids are ordered high-to-low, so their range runs from maxPrice down to minPrice
+            if (side == Side::BUY) sweepLevels(bids, bids.lower_bound(maxPrice), bids.upper_bound(minPrice), bidVolume, out);
+            else sweepLevels(asks, asks.lower_bound(minPrice), asks.upper_bound(maxPrice), askVolume, out);
+        }
+        finishBulk(out);
+        return out;
+    }
+
+    // Every resting order carrying this owner tag, on both sides.
+    CancelResult cancelOwner(uint32_t owner) {
+        CancelResult out;
+        auto found = ownerOrders.find(owner);
+        if (found != ownerOrders.end()) {
+            // Detach the index entry first so unlinkResting() has nothing to update
+            std::unordered_set<uint64_t> ids = std::move(found->second);
+            ownerOrders.erase(found);
+            out.ids.reserve(ids.size());
+            out.quantities.reserve(ids.size());
+            for (uint64_t id : ids) {
+                auto orderIt = orderMap.at(id);
+                out.ids.push_back(id);
+                out.quantities.push_back(orderIt->quantity);
+                unlinkResting(orderIt);
+            }
+        }
+        finishBulk(out);
+        return out;
+    }
 
-        double price = orderPriceMap[orderId];
-        Side side = (*orderMap[orderId]).side;
+private:
+    uint32_t submitLimit(const Order& order) {
+        ++stats.addsReceived;
+        return sampled(stats.addCycles, [&]() {
+            return order.side == Side::BUY ? handleBuyOrder(order) : handleSellOrder(order);
+        });
+    }
+
+    // Removes a resting order; false if the id is not in the book.
+    bool cancelResting(uint64_t orderId) {
+        auto found = orderMap.find(orderId);
+        if (found == orderMap.end()) return false;
+        unlinkResting(found->second);
+        if (logging) std::cout << "Order " << orderId << " canceled successfully." << std::endl;
+        return true;
+    }
+
+    // Takes one resting order out of its level, the side volume and the indexes.
+    void unlinkResting(std::list<Order>::iterator orderIt) {
+        double price = orderIt->price;
+        Side side = orderIt->side;
+        uint32_t qty = orderIt->quantity;
+        forgetOrder(*orderIt);
 
         if (side == Side::BUY) {
-            bids.at(price).orders.erase(orderMap[orderId]);
-            if (bids.at(price).orders.empty()) bids.erase(price);
+            Limit& limit = bids.at(price);
+            limit.totalVolume -= qty;
+            bidVolume -= qty;
+            limit.orders.erase(orderIt);
+            if (limit.orders.empty()) {
+                bids.erase(price);
+                ++stats.levelsErased;
+            }
         } else {
-            asks.at(price).orders.erase(orderMap[orderId]);
-            if (asks.at(price).orders.empty()) asks.erase(price);
+            Limit& limit = asks.at(price);
+            limit.totalVolume -= qty;
+            askVolume -= qty;
+            limit.orders.erase(orderIt);
+            if (limit.orders.empty()) {
+                asks.erase(price);
+                ++stats.levelsErased;
+            }
         }
+    }
 
-        orderMap.erase(orderId);
-        orderPriceMap.erase(orderId);
-        std::cout << "Order " << orderId << " canceled successfully." << std::endl;
+    // Empties every level in [it, end): whole levels go at once, so there is no
+    // per-order level lookup and each level is erased exactly once.
+    template <typename Levels>
+    void sweepLevels(Levels& levels, typename Levels::iterator it, typename Levels::iterator end,
+                     uint64_t& sideVolume, CancelResult& out) {
+        while (it != end) {
+            const Limit& limit = it->second;
+            for (const Order& o : limit.orders) {
+                out.ids.push_back(o.id);
+                out.quantities.push_back(o.quantity);
+                forgetOrder(o);
+            }
+            sideVolume -= limit.totalVolume;
+            it = levels.erase(it);
+            ++stats.levelsErased;
+        }
     }
 
-private:
-    void handleBuyOrder(Order order) {
+    void finishBulk(const CancelResult& out) {
+        ++stats.bulkCancels;
+        stats.ordersBulkCancelled += out.ids.size();
+        if (logging) std::cout << "Bulk cancel: " << out.ids.size() << " orders canceled." << std::endl;
+    }
+
+    // Drops a departing resting order from the id maps and owner index.
+    void forgetOrder(const Order& order) {
+        orderMap.erase(order.id);
+        orderPriceMap.erase(order.id);
+        if (order.owner == 0) return;
+        auto it = ownerOrders.find(order.owner);
+        if (it == ownerOrders.end()) return;
+        it->second.erase(order.id);
+        if (it->second.empty()) ownerOrders.erase(it);
+    }
+
+    void noteRested(const Order& order) {
+        if (order.owner != 0) ownerOrders[order.owner].insert(order.id);
+        ++stats.ordersRested;
+        if (orderMap.size() > stats.peakRestingOrders) stats.peakRestingOrders = orderMap.size();
+    }
+
+    // Both handlers return the executed quantity; restResidual=false gives IOC semantics.
+    uint32_t handleBuyOrder(Order order, bool restResidual = true) {
+        uint32_t executed = 0;
         // 1. MATCHING ENGINE
         // Since asks are sorted in ascending order, begin() always provides the best ask price.
         while (order.quantity > 0 && !asks.empty() && order.price >= asks.begin()->first) {
@@ -80,38 +346,47 @@ private:
                 uint32_t matchQty = std::min(order.quantity, sittingOrder.quantity);
 
                 // A TRADE OCCURRED!
-                std::cout << "TRADE: Buy Order " << order.id << " matched with Sell Order " 
+                if (logging) std::cout << "TRADE: Buy Order " << order.id << " matched with Sell Order " 
                           << sittingOrder.id << " | Qty: " << matchQty << " @ Price: " << sittingOrder.price << std::endl;
 
                 order.quantity -= matchQty;
+                executed += matchQty;
+                ++stats.matches;
+                stats.matchedVolume += matchQty;
                 sittingOrder.quantity -= matchQty;
                 bestAskLimit.totalVolume -= matchQty;
+                askVolume -= matchQty;
 
                 if (sittingOrder.quantity == 0) {
-                    orderMap.erase(sittingOrder.id);
-                    orderPriceMap.erase(sittingOrder.id);
+                    forgetOrder(sittingOrder);
                     bestAskLimit.orders.pop_front();
                 }
             }
 
             if (bestAskLimit.orders.empty()) {
                 asks.erase(asks.begin());
+                ++stats.levelsErased;
             }
         }
 
         // 2. RESIDUAL ORDER
         // If the order is not fully filled, add the remaining quantity to the bid side.
-        if (order.quantity > 0) {
+        if (restResidual && order.quantity > 0) {
             if (bids.find(order.price) == bids.end()) {
                 bids.emplace(order.price, Limit(order.price));
+                ++stats.levelsCreated;
             }
             bids.at(order.price).addOrder(order);
+            bidVolume += order.quantity;
             orderMap[order.id] = --bids.at(order.price).orders.end();
             orderPriceMap[order.id] = order.price;
+            noteRested(order);
         }
+        return executed;
     }
 
-    void handleSellOrder(Order order) {
+    uint32_t handleSellOrder(Order order, bool restResidual = true) {
+        uint32_t executed = 0;
         // 1. MATCHING ENGINE (Against Bids)
         // Since bids are sorted in descending order (std::greater), 
         // begin() provides the highest bidder (Best Bid).
@@ -122,34 +397,42 @@ private:
                 auto& sittingOrder = bestBidLimit.orders.front();
                 uint32_t matchQty = std::min(order.quantity, sittingOrder.quantity);
 
-                std::cout << "TRADE: Sell Order " << order.id << " matched with Buy Order " 
+                if (logging) std::cout << "TRADE: Sell Order " << order.id << " matched with Buy Order " 
                           << sittingOrder.id << " | Qty: " << matchQty << " @ Price: " << sittingOrder.price << std::endl;
 
                 order.quantity -= matchQty;
+                executed += matchQty;
+                ++stats.matches;
+                stats.matchedVolume += matchQty;
                 sittingOrder.quantity -= matchQty;
                 bestBidLimit.totalVolume -= matchQty;
+                bidVolume -= matchQty;
 
                 if (sittingOrder.quantity == 0) {
-                    orderMap.erase(sittingOrder.id);
-                    orderPriceMap.erase(sittingOrder.id);
+                    forgetOrder(sittingOrder);
                     bestBidLimit.orders.pop_front();
                 }
             }
 
             if (bestBidLimit.orders.empty()) {
                 bids.erase(bids.begin());
+                ++stats.levelsErased;
             }
         }
 
         // 2. RESIDUAL ORDER (Add remaining to Asks)
-        if (order.quantity > 0) {
+        if (restResidual && order.quantity > 0) {
             if (asks.find(order.price) == asks.end()) {
                 asks.emplace(order.price, Limit(order.price));
+                ++stats.levelsCreated;
             }
             asks.at(order.price).addOrder(order);
+            askVolume += order.quantity;
             orderMap[order.id] = --asks.at(order.price).orders.end();
             orderPriceMap[order.id] = order.price;
+            noteRested(order);
         }
+        return executed;
     }
 };
 
@@ -1,4 +1,39 @@
 import os
+import sys
+import threading
+import time
+
+# ANSI control sequences: cursor home, clear to end of screen, hide/show cursor
+ANSI_HOME = "\x1b[H"
+ANSI_CLEAR_BELOW = "\x1b[J"
+ANSI_CLEAR_SCREEN = "\x1b[2J"
+ANSI_HIDE_CURSOR = "\x1b[?25l"
+ANSI_SHOW_CURSOR = "\x1b[?25h"
+
+
+def _render_lines(step, mid, inv, cash, pnl, ai_adj):
+    """Builds the dashboard body shared by the inline and threaded dashboards."""
+    # Dynamic Strategy Mode Detection based on AI Signal intensity
+    # Determines if the bot is in trend-following or mean-reversion mode
+    if abs(ai_adj) > 0.005:
+        status = "AGGRESSIVE (Trend-Following)"
+    else:
+        status = "DEFENSIVE (Classical Stoikov)"
+
+    return [
+        "="*60,
+        f"      AEGIS-LOB: LIVE RISK DASHBOARD (Step: {step})",
+        "="*60,
+        f"Market Mid-Price    : {mid:>15.2f}",
+        f"Current Inventory   : {inv:>15.8f} Units",
+        f"Cash Balance        : {cash:>15.2f} USDT",
+        f"Cumulative P&L      : {pnl:>15.2f} USDT",
+        "-" * 60,
+        f"Operating Mode      : {status}",
+        f"AI Alpha Signal     : {ai_adj:>15.4f}",
+        "="*60,
+    ]
+
 
 class LiveRiskDashboard:
     def __init__(self):
@@ -14,23 +49,98 @@ class LiveRiskDashboard:
         # Refresh the screen every 50 steps to ensure readability without terminal lag
         if step % 50 == 0:
             os.system('cls' if os.name == 'nt' else 'clear')
-            print("="*60)
-            print(f"      AEGIS-LOB: LIVE RISK DASHBOARD (Step: {step})")
-            print("="*60)
-            print(f"Market Mid-Price    : {mid:>15.2f}")
-            print(f"Current Inventory   : {inv:>15.8f} Units")
-            print(f"Cash Balance        : {cash:>15.2f} USDT")
-            print(f"Cumulative P&L      : {pnl:>15.2f} USDT")
-            print("-" * 60)
-            
-            # Dynamic Strategy Mode Detection based on AI Signal intensity
-            # Determines if the bot is in trend-following or mean-reversion mode
-            if abs(ai_adj) > 0.005:
-                status = "AGGRESSIVE (Trend-Following)"
-            else:
-                status = "DEFENSIVE (Classical Stoikov)"
-                
-            print(f"Operating Mode      : {status}")
-            print(f"AI Alpha Signal     : {ai_adj:>15.4f}")
-            print("="*60)
-            print("\nSimulation in progress...")
\ No newline at end of file
+            print("\n".join(_render_lines(step, mid, inv, cash, pnl, ai_adj)))
+            print("\nSimulation in progress...")
+
+
+class ThreadedRiskDashboard:
+    def __init__(self, refresh_hz=4.0, stream=None):
+        """
+        Non-blocking dashboard. update() only publishes a snapshot tuple; a daemon
+        thread redraws it at a fixed wall-clock rate using ANSI cursor control, so
+        the trading loop never waits on the terminal or forks a process.
+        When the stream is not a TTY (redirected to a file or pipe) no escape codes
+        are written and only the final snapshot is printed, as plain text.
+        """
+        self.interval = 1.0 / refresh_hz
+        self.stream = stream or sys.stdout
+        isatty = getattr(self.stream, "isatty", None)
+        self.ansi = bool(isatty and isatty())
+        self.step = 0
+        self._snapshot = None
+        self._lat_total_ns = 0
+        self._lat_count = 0
+        self._lat_max_ns = 0
+        self._throughput = 0.0
+        self._latency_report = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._render_loop, name="risk-dashboard", daemon=True)
+        if self.ansi:
+            if os.name == 'nt':
+                os.system('')  # One-off call that enables VT escape processing on Windows consoles
+            self.stream.write(ANSI_CLEAR_SCREEN + ANSI_HIDE_CURSOR)
+        self._thread.start()
+
+    def update(self, step, mid, inv, cash, pnl, ai_adj, quote_latency_ns=None):
+        """
+        O(1) publish from the trading thread. quote_latency_ns is the tick-to-quote
+        time of this step, if the caller measured it.
+        """
+        self.step = step
+        if quote_latency_ns is not None:
+            self._lat_total_ns += quote_latency_ns
+            self._lat_count += 1
+            if quote_latency_ns > self._lat_max_ns: self._lat_max_ns = quote_latency_ns
+        # Single attribute store: the render thread always sees a consistent tuple
+        self._snapshot = (step, mid, inv, cash, pnl, ai_adj, quote_latency_ns,
+                          self._lat_total_ns, self._lat_count, self._lat_max_ns)
+
+    def publish_latency_report(self, report):
+        """Publishes a per-stage latency report (StoikovBot.get_latency_report())."""
+        self._latency_report = report
+
+    def _render_loop(self):
+        last_step, last_t = None, time.perf_counter()
+        while not self._stop.wait(self.interval):
+            snap = self._snapshot
+            if snap is None:
+                continue
+            now = time.perf_counter()
+            if last_step is not None:
+                self._throughput = (snap[0] - last_step) / (now - last_t)
+            last_step, last_t = snap[0], now
+            if self.ansi:
+                self._draw(snap, self._throughput)
+
+    def _draw(self, snap, throughput):
+        step, mid, inv, cash, pnl, ai_adj, lat_ns, lat_total, lat_count, lat_max = snap
+        lines = _render_lines(step, mid, inv, cash, pnl, ai_adj)
+        lines.insert(-1, f"Loop Throughput     : {throughput:>15.1f} steps/s")
+        if lat_count:
+            if lat_ns is not None:
+                lines.insert(-1, f"Tick-to-Quote (last): {lat_ns / 1e3:>15.1f} us")
+            lines.insert(-1, f"Tick-to-Quote (avg) : {lat_total / lat_count / 1e3:>15.1f} us")
+            lines.insert(-1, f"Tick-to-Quote (max) : {lat_max / 1e3:>15.1f} us")
+        report = self._latency_report
+        if report:
+            lines.append(f"{'Stage':<20}{'p50 us':>12}{'p99 us':>12}{'max us':>12}")
+            for stage, st in report.items():
+                if st.get("count"):
+                    lines.append(f"{stage:<20}{st['p50_us']:>12.1f}{st['p99_us']:>12.1f}{st['max_us']:>12.1f}")
+            lines.append("="*60)
+        if self.ansi:
+            lines.append("\nSimulation in progress...")
+            self.stream.write(ANSI_HOME + "\n".join(lines) + "\n" + ANSI_CLEAR_BELOW)
+        else:
+            self.stream.write("\n".join(lines) + "\n")
+        self.stream.flush()
+
+    def close(self):
+        """Stops the render thread after drawing the final snapshot."""
+        self._stop.set()
+        self._thread.join()
+        if self._snapshot is not None:
+            self._draw(self._snapshot, self._throughput)
+        if self.ansi:
+            self.stream.write(ANSI_SHOW_CURSOR)
+            self.stream.flush()
@@ -1,18 +1,21 @@
-import pandas as pd
+import numpy as np
 import os
+import json
+import queue
+import threading
+from data_stream import data_dir, data_path
 
 class DataLogger:
     def __init__(self, filename="market_data.csv"):
         """
         Initializes the Aegis-LOB telemetry service.
-        Persists simulation data into the 'data/' directory for post-trade analysis.
+        Persists simulation data into the data directory for post-trade analysis.
         """
-        self.filename = os.path.join("data", filename)
+        self.filename = data_path(filename)
         self.buffer = []
         
         # Ensure the persistence directory exists
-        if not os.path.exists("data"):
-            os.makedirs("data")
+        os.makedirs(data_dir(), exist_ok=True)
 
     def log(self, step, mid, bid, ask, inv, pnl):
         """
@@ -35,10 +38,201 @@ class DataLogger:
             print(f"⚠️ [WARNING] No data captured for {self.filename}. Check log() calls.")
             return
 
+        import pandas as pd
         df = pd.DataFrame(self.buffer)
         df.to_csv(self.filename, index=False)
         print(f"--- ✅ TELEMETRY SECURED: {self.filename} ({len(self.buffer)} records) ---")
 
     def clear(self):
         """Clears the buffer for fresh simulation runs."""
-        self.buffer = []
\ No newline at end of file
+        self.buffer = []
+
+    def save_latency_report(self, report):
+        """Writes a StoikovBot.get_latency_report() next to the telemetry file."""
+        return export_latency_report(report, self.filename)
+
+
+def export_latency_report(report, telemetry_path):
+    """
+    Serializes a per-stage latency report as '<telemetry stem>_latency.json'.
+    """
+    path = os.path.splitext(telemetry_path)[0] + "_latency.json"
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"--- ✅ LATENCY REPORT SECURED: {path} ---")
+    return path
+
+# --- Streaming binary telemetry ---
+# Fixed record schema shared by StreamingDataLogger and read_telemetry().
+TELEMETRY_DTYPE = np.dtype([
+    ("step", "<i8"),
+    ("mid", "<f8"),
+    ("bid", "<f8"),
+    ("ask", "<f8"),
+    ("inv", "<f8"),
+    ("pnl", "<f8"),
+])
+TELEMETRY_MAGIC = b"AEGTLM01"
+
+
+class StreamingDataLogger:
+    def __init__(self, filename="market_data.bin", capacity=65536, n_buffers=4, flush_interval=1.0,
+                 block_when_full=False):
+        """
+        Bounded-memory telemetry service for long simulations.
+        log() writes into a preallocated NumPy record buffer; full buffers are handed
+        to a background thread that appends them to a raw binary file. Memory is capped
+        at n_buffers * capacity records, and partial buffers are flushed every
+        flush_interval seconds so a crash loses at most that much data.
+        With block_when_full=False (live trading) records are dropped and counted if
+        the writer falls behind; offline backtests should pass True to apply backpressure.
+        """
+        self.filename = data_path(filename)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.block_when_full = block_when_full
+        self.records = 0
+        self.dropped = 0
+
+        os.makedirs(data_dir(), exist_ok=True)
+
+        self._free = queue.Queue()
+        for _ in range(n_buffers - 1):
+            self._free.put(np.empty(capacity, dtype=TELEMETRY_DTYPE))
+        self._full = queue.Queue()
+        self._active = np.empty(capacity, dtype=TELEMETRY_DTYPE)
+        self._n = 0
+        # Guards _active/_n against the writer taking over a partial buffer
+        self._lock = threading.Lock()
+        self._error = None
+
+        with open(self.filename, "wb") as f:
+            f.write(TELEMETRY_MAGIC)
+        self._file = open(self.filename, "ab")
+        self._writer = threading.Thread(target=self._write_loop, name="telemetry-writer", daemon=True)
+        self._writer.start()
+
+    def log(self, step, mid, bid, ask, inv, pnl):
+        """
+        Captures one telemetry record. Never touches the file: at worst it swaps
+        buffers, and if the writer has fallen behind the record is counted as dropped.
+        Raises RuntimeError if the writer thread has failed.
+        """
+        if self._error is not None:
+            self._raise_writer_error()
+        if self._active is None and not self._acquire_buffer():
+            self.dropped += 1
+            return
+        with self._lock:
+            self._active[self._n] = (step, mid, bid, ask, inv, pnl)
+            self._n += 1
+            if self._n == self.capacity:
+                self._full.put((self._active, self._n))
+                self._active = None
+                self._n = 0
+        self.records += 1
+
+    def _acquire_buffer(self):
+        # Blocks (outside the lock) only with block_when_full=True
+        try:
+            buf = self._free.get(block=self.block_when_full)
+        except queue.Empty:
+            return False
+        if buf is None:
+            # The writer died and woke us up instead of returning a buffer
+            self._raise_writer_error()
+        self._active = buf
+        return True
+
+    def _raise_writer_error(self):
+        raise RuntimeError(f"telemetry writer for {self.filename} failed: {self._error!r}") from self._error
+
+    def _write_loop(self):
+        try:
+            while True:
+                try:
+                    item = self._full.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    self._flush_partial()
+                    continue
+                if item is None:
+                    break
+                buf, n = item
+                self._file.write(buf[:n])
+                self._file.flush()
+                self._free.put(buf)
+        except Exception as exc:
+            self._error = exc
+            # Unblock a producer waiting in _acquire_buffer()
+            self._free.put(None)
+
+    def _flush_partial(self):
+        """
+        Timer tick: takes over whatever the producer has buffered so far (handing it a
+        spare buffer), so an idle producer still gets flushed. Skipped while full buffers
+        are queued, which keeps records in order (they are written first and the next
+        tick catches up). Only without a spare buffer (n_buffers=1) is the data copied.
+        """
+        with self._lock:
+            if self._n == 0 or not self._full.empty():
+                return
+            try:
+                spare = self._free.get_nowait()
+            except queue.Empty:
+                spare = None
+            if spare is None:
+                buf, n = self._active[:self._n].copy(), self._n
+            else:
+                buf, n = self._active, self._n
+                self._active = spare
+            self._n = 0
+        self._file.write(buf[:n])
+        self._file.flush()
+        if spare is not None:
+            self._free.put(buf)
+
+    def save(self):
+        """
+        Flushes everything captured so far and stops the writer thread.
+        Re-raises (as RuntimeError) an error that stopped the writer.
+        """
+        with self._lock:
+            if self._n:
+                self._full.put((self._active, self._n))
+                self._active = None
+                self._n = 0
+        self._full.put(None)
+        self._writer.join()
+        self._file.close()
+        if self._error is not None:
+            self._raise_writer_error()
+        if self.dropped:
+            print(f"⚠️ [WARNING] {self.dropped} records dropped: writer fell behind ({self.filename}).")
+        print(f"--- ✅ TELEMETRY SECURED: {self.filename} ({self.records} records) ---")
+
+    close = save
+
+    def save_latency_report(self, report):
+        """Writes a StoikovBot.get_latency_report() next to the telemetry file."""
+        return export_latency_report(report, self.filename)
+
+
+def read_telemetry(path):
+    """
+    Memory-maps a StreamingDataLogger file as a structured array (fields in
+    TELEMETRY_DTYPE). A trailing partial record from an interrupted run is ignored.
+    """
+    n = (os.path.getsize(path) - len(TELEMETRY_MAGIC)) // TELEMETRY_DTYPE.itemsize
+    if n <= 0:
+        return np.empty(0, dtype=TELEMETRY_DTYPE)
+    with open(path, "rb") as f:
+        if f.read(len(TELEMETRY_MAGIC)) != TELEMETRY_MAGIC:
+            raise ValueError(f"{path} is not an Aegis telemetry file")
+    return np.memmap(path, dtype=TELEMETRY_DTYPE, mode="r", offset=len(TELEMETRY_MAGIC), shape=(n,))
+
+
+def iter_telemetry_chunks(path, chunk_size=1_000_000):
+    """Yields consecutive structured-array views of a telemetry file."""
+    records = read_telemetry(path)
+    for start in range(0, len(records), chunk_size):
+        yield records[start:start + chunk_size]
@@ -0,0 +1,61 @@
+import os
+import numpy as np
+
+# Columns consumed by the backtest loops. Historical OHLCV has no LOB
+# imbalance, so missing quantity columns default to 1.0 (see download_data.py).
+MARKET_COLUMNS = ("close", "high", "low", "bid_qty", "ask_qty")
+DEFAULT_FILL = {"bid_qty": 1.0, "ask_qty": 1.0}
+
+# Datasets, models, caches and telemetry live under one data directory, resolved
+# against the working directory (never the install location) unless overridden.
+DATA_DIR_ENV = "AEGIS_DATA_DIR"
+
+
+def data_dir():
+    """Returns $AEGIS_DATA_DIR, or 'data' relative to the current working directory."""
+    return os.environ.get(DATA_DIR_ENV) or "data"
+
+
+def data_path(*parts):
+    """Joins parts onto data_dir(), e.g. data_path("models", "price_lstm.pth")."""
+    return os.path.join(data_dir(), *parts)
+
+
+def iter_market_chunks(file_path, chunk_size=100_000, columns=MARKET_COLUMNS):
+    """
+    Streams an on-disk OHLCV dataset as fixed-size chunks of NumPy arrays.
+    Yields (start_index, {column: float64 array}) so callers can keep a global
+    bar index across chunk boundaries. Only one chunk is resident at a time.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(file_path)
+    import pandas as pd
+
+    header = pd.read_csv(file_path, nrows=0).columns
+    present = [c for c in columns if c in header]
+    missing = [c for c in columns if c not in header]
+    for c in missing:
+        if c not in DEFAULT_FILL:
+            raise KeyError(f"'{c}' column missing from {file_path}")
+
+    start = 0
+    reader = pd.read_csv(file_path, usecols=present, chunksize=chunk_size)
+    for frame in reader:
+        n = len(frame)
+        chunk = {c: frame[c].to_numpy(dtype=np.float64) for c in present}
+        for c in missing:
+            chunk[c] = np.full(n, DEFAULT_FILL[c])
+        yield start, chunk
+        start += n
+
+
+def iter_market_bars(file_path, chunk_size=100_000, columns=MARKET_COLUMNS):
+    """
+    Flattens iter_market_chunks into (index, close, high, low, bid_qty, ask_qty)
+    tuples. Values are converted chunk-wise with tolist() to avoid per-bar
+    NumPy scalar overhead in the Python hot loop.
+    """
+    for start, chunk in iter_market_chunks(file_path, chunk_size, columns):
+        cols = [chunk[c].tolist() for c in columns]
+        for offset, values in enumerate(zip(*cols)):
+            yield (start + offset, *values)
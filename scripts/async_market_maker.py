@@ -0,0 +1,217 @@
+import sys
+import os
+# Project root setup for relative imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+import asyncio
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import aegis_lob as lob
+from strategy.stoikov_strategy import StoikovBot
+from strategy.latency import LatencyRecorder, TimedOrderBook
+from strategy.order_manager import QuoteManager
+
+# One top-of-book update. ts_ns is the exchange-side (scheduled) time of the tick.
+Tick = namedtuple("Tick", "seq ts_ns mid best_bid best_ask bid_qty ask_qty")
+# One quote decision, tagged with the tick it was computed from.
+Quote = namedtuple("Quote", "tick bid ask qty ready_ns")
+
+
+class SimulatedFeed:
+    """
+    Local random-walk feed emitting ticks on a fixed wall-clock schedule.
+    If the consumer falls behind, overdue ticks are delivered back to back,
+    exactly like a socket buffer draining after a stall.
+    """
+    def __init__(self, interval_s=0.0005, start_price=100.0, sigma=0.02, spread=0.01, seed=7):
+        self.interval_ns = int(interval_s * 1e9)
+        self.price = start_price
+        self.sigma = sigma
+        self.spread = spread
+        self.rng = np.random.default_rng(seed)
+
+    async def ticks(self, duration_s):
+        start = time.perf_counter_ns()
+        end = start + int(duration_s * 1e9)
+        seq = 0
+        while True:
+            due = start + seq * self.interval_ns
+            if due >= end:
+                return
+            now = time.perf_counter_ns()
+            if due > now:
+                await asyncio.sleep((due - now) / 1e9)
+            self.price += self.rng.normal(0.0, self.sigma)
+            half = self.spread / 2
+            yield Tick(seq, due, self.price, self.price - half, self.price + half,
+                       float(self.rng.uniform(0.5, 5.0)), float(self.rng.uniform(0.5, 5.0)))
+            seq += 1
+            if seq % 64 == 0:
+                await asyncio.sleep(0)  # Let the other tasks run during a backlog burst
+
+
+class LatestTickSlot:
+    """
+    Single-slot coalescing buffer between ingestion and quoting. publish() overwrites
+    any tick the quoter has not picked up yet, so the quoter always works from the
+    newest book state and intermediate ticks are dropped (and counted).
+    """
+    def __init__(self):
+        self.tick = None
+        self.coalesced = 0
+        self._ready = asyncio.Event()
+
+    def publish(self, tick):
+        if self._ready.is_set():
+            self.coalesced += 1
+        self.tick = tick
+        self._ready.set()
+
+    async def take(self):
+        await self._ready.wait()
+        self._ready.clear()
+        return self.tick
+
+
+class AsyncMarketMaker:
+    def __init__(self, bot=None, book=None, order_queue_size=4, max_quote_age_s=0.005, lot_size=0.001,
+                 tick_size=0.01, max_msgs_per_sec=2000):
+        """
+        Asyncio runtime joining three tasks: feed ingestion -> coalescing slot ->
+        quoting (StoikovBot on a dedicated worker thread) -> bounded order queue ->
+        submission to the OrderBook through a QuoteManager. Quotes whose source tick
+        is older than max_quote_age_s once a newer tick exists are skipped as stale.
+        """
+        self.bot = bot or StoikovBot(gamma=0.1, sigma=0.002, k=1.5, stop_loss=-500.0)
+        self.bot.load_model()  # Pay the torch import now, not on the first quote
+        self.book = book or lob.OrderBook()
+        self.book.set_logging(False)  # Per-event std::cout writes would sit on the submit path
+        self.slot = LatestTickSlot()
+        self.orders = asyncio.Queue(maxsize=order_queue_size)
+        # Set once quoting has finished; the order task drains the queue and exits.
+        # Out of band, so the quote task's drop-oldest can never discard it.
+        self._stopping = asyncio.Event()
+        self.max_quote_age_ns = int(max_quote_age_s * 1e9)
+        self.latency = LatencyRecorder()
+        # Book calls made by the manager are timed as their own 'book.*' stages
+        self.manager = QuoteManager(TimedOrderBook(self.book, self.latency), tick_size=tick_size,
+                                    max_msgs_per_sec=max_msgs_per_sec, lot_size=lot_size)
+        self.counters = {"ticks": 0, "quotes": 0, "stale_skipped": 0, "queue_dropped": 0}
+        # All bot access (quotes and fills) is serialized on this one thread
+        self._bot_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quoting")
+
+    async def run(self, feed, duration_s):
+        quoting = asyncio.create_task(self._quote_task())
+        ordering = asyncio.create_task(self._order_task())
+        try:
+            await self._feed_task(feed, duration_s)
+        finally:
+            self.slot.publish(None)
+            try:
+                await quoting
+            finally:
+                self._stopping.set()
+                await ordering
+                self._bot_thread.shutdown()
+        return self.get_metrics()
+
+    async def _feed_task(self, feed, duration_s):
+        async for tick in feed.ticks(duration_s):
+            self.latency.record("feed_lag", time.perf_counter_ns() - tick.ts_ns)
+            self.counters["ticks"] += 1
+            self._check_fills(tick)
+            self.slot.publish(tick)
+
+    async def _quote_task(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            tick = await self.slot.take()
+            if tick is None:
+                return
+            t0 = time.perf_counter_ns()
+            self.latency.record("slot_wait", t0 - tick.ts_ns)
+            bid, ask, qty = await loop.run_in_executor(
+                self._bot_thread, self.bot.calculate_quotes, tick.mid, tick.bid_qty, tick.ask_qty)
+            ready = time.perf_counter_ns()
+            self.latency.record("quote_compute", ready - t0)
+            self.counters["quotes"] += 1
+
+            newest = self.slot.tick
+            if newest is not None and newest.seq > tick.seq and ready - tick.ts_ns > self.max_quote_age_ns:
+                self.counters["stale_skipped"] += 1
+                continue
+
+            quote = Quote(tick, bid, ask, qty, ready)
+            if self.orders.full():
+                # Only the latest decision matters: drop the oldest queued quote
+                self.orders.get_nowait()
+                self.counters["queue_dropped"] += 1
+            self.orders.put_nowait(quote)
+
+    async def _order_task(self):
+        stopping = asyncio.create_task(self._stopping.wait())
+        while True:
+            if stopping.done() and self.orders.empty():
+                return
+            getting = asyncio.create_task(self.orders.get())
+            await asyncio.wait((getting, stopping), return_when=asyncio.FIRST_COMPLETED)
+            if not getting.done():
+                getting.cancel()
+                continue
+            quote = getting.result()
+            now = time.perf_counter_ns()
+            self.latency.record("order_queue", now - quote.ready_ns)
+            self._submit(quote)
+            done = time.perf_counter_ns()
+            self.latency.record("submit", done - now)
+            self.latency.record("tick_to_submit", done - quote.tick.ts_ns)
+
+    def _submit(self, quote):
+        """Hands the new quote to the QuoteManager, which only touches the book on real changes."""
+        self.manager.update(quote.bid, quote.ask, quote.qty)
+
+    def _check_fills(self, tick):
+        """
+        Simulated execution: the market trading through our resting price fills it.
+        The bot update is queued behind any in-flight quote instead of awaited, so
+        ingestion never waits on the quoting thread.
+        """
+        for side, price, qty in self.manager.check_fills(tick.best_ask, tick.best_bid):
+            self._bot_thread.submit(self.bot.on_trade, side, price, qty)
+
+    def get_metrics(self):
+        """Counters, order-management stats and per-stage lag percentiles (microseconds)."""
+        return {"counters": dict(self.counters, coalesced=self.slot.coalesced),
+                "orders": self.manager.stats(),
+                "latency": self.latency.report()}
+
+
+def print_metrics(metrics):
+    print("\n" + "="*60)
+    print("      AEGIS-LOB: ASYNC RUNTIME REPORT")
+    print("="*60)
+    for name, value in metrics["counters"].items():
+        print(f"{name:<20}: {value:>12}")
+    print("-"*60)
+    orders = metrics["orders"]
+    print(f"{'messages sent':<20}: {orders['messages']:>12} (naive: {orders['naive_messages']})")
+    print(f"{'messages saved':<20}: {orders['messages_saved']:>12} ({orders['messages_saved_pct']:.1f}%)")
+    print(f"{'kept / replaced':<20}: {orders['kept']:>12} / {orders['replaced']}")
+    print(f"{'throttled':<20}: {orders['throttled']:>12}")
+    print(f"{'fill rate':<20}: {orders['fill_rate']:>12.4f} (naive: {orders['naive_fill_rate']:.4f})")
+    print("-"*60)
+    print(f"{'Stage':<20}{'p50 us':>12}{'p99 us':>12}{'max us':>12}")
+    for stage, st in metrics["latency"].items():
+        if st.get("count"):
+            print(f"{stage:<20}{st['p50_us']:>12.1f}{st['p99_us']:>12.1f}{st['max_us']:>12.1f}")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    runtime = AsyncMarketMaker()
+    metrics = asyncio.run(runtime.run(SimulatedFeed(interval_s=0.0005), duration_s=5.0))
+    print_metrics(metrics)
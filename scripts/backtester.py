@@ -4,82 +4,92 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
 if project_root not in sys.path:
     sys.path.append(project_root)
-import pandas as pd
+import time
 import numpy as np
 import aegis_lob as lob
 from strategy.stoikov_strategy import StoikovBot
 from strategy.risk_analyzer import RiskAnalyzer
-from visualizer import plot_session
-from dashboard import LiveRiskDashboard
-from data_logger import DataLogger
+from dashboard import ThreadedRiskDashboard
+from data_logger import StreamingDataLogger
+from data_stream import data_path, iter_market_chunks
 
 
 
-def run_real_backtest(file_path):
-    ob = lob.OrderBook()
-    
+def run_real_backtest(file_path, chunk_size=100_000, results_file="real_data_backtest_results.bin",
+                      track_latency=False):
     # Bot Setup (Kelly ve Stoikov Parameters)
     bot = StoikovBot(gamma=0.7, sigma=0.005, k=1.5, stop_loss=-50.0)
+    if track_latency:
+        # Per-stage histograms for the dashboard and a *_latency.json next to the results
+        bot.enable_latency_tracking()
+    bot.load_model()  # Keep the torch import out of the first bar's quote latency
     
-    dashboard = LiveRiskDashboard()
-    logger = DataLogger("real_data_backtest_log.csv")
-    risk_engine = RiskAnalyzer()
+    dashboard = ThreadedRiskDashboard()
+    risk_engine = RiskAnalyzer(streaming=True)
 
-    # 1. Veriyi Yükle
-    df = pd.read_csv(file_path)
-    results = []
+    # Per-bar results go to a bounded binary telemetry stream, not a list
+    results_logger = StreamingDataLogger(results_file, block_when_full=True)
 
+    # 1. Stream the data in fixed-size chunks. Bot state (price history,
+    # inventory, risk locks) lives on the objects above and carries across
+    # chunk boundaries.
     print(f"--- DYNAMIC RISK (KELLY) ANALYSIS HAS STARTED: {file_path} ---")
 
-    for i, row in df.iterrows():
-        mid = row['close']
-        high = row['high']
-        low = row['low']
-        v_bid = row['bid_qty'] if 'bid_qty' in row else 1.0
-        v_ask = row['ask_qty'] if 'ask_qty' in row else 1.0
+    finished = False
+    for start, chunk in iter_market_chunks(file_path, chunk_size):
+        rows = zip(chunk['close'].tolist(), chunk['high'].tolist(), chunk['low'].tolist(),
+                   chunk['bid_qty'].tolist(), chunk['ask_qty'].tolist())
+
+        for j, (mid, high, low, v_bid, v_ask) in enumerate(rows):
+            i = start + j
+
+            # --- 2. GET THE QUOTES FROM THE BOT ---
+            t_tick = time.perf_counter_ns()
+            my_bid, my_ask, qty_kelly = bot.calculate_quotes(mid, v_bid, v_ask)
+            quote_latency_ns = time.perf_counter_ns() - t_tick
 
-        # --- 2. GET THE QUOTES FROM THE BOT ---
-        my_bid, my_ask, qty_kelly = bot.calculate_quotes(mid, v_bid, v_ask)
+            # 3. Pairing Simulation
+            if not bot.is_stopped:
+                # Is the buy order filled? (Kelly Qty amount)
+                if low <= my_bid and my_bid > 0:
+                    bot.on_trade(lob.Side.BUY, my_bid, qty_kelly)
+                # Did the sell order get filled? (Kelly Qty amount)
+                elif high >= my_ask and my_ask > 0:
+                    bot.on_trade(lob.Side.SELL, my_ask, qty_kelly)
 
-        # 3. Pairing Simulation
-        if not bot.is_stopped:
-            # Is the buy order filled? (Kelly Qty amount)
-            if low <= my_bid and my_bid > 0:
-                bot.on_trade(lob.Side.BUY, my_bid, qty_kelly)
-            # Did the sell order get filled? (Kelly Qty amount)
-            elif high >= my_ask and my_ask > 0:
-                bot.on_trade(lob.Side.SELL, my_ask, qty_kelly)
+            # 4. Calculate P&L and Risk Metrics
+            # P&L Calculation
+            current_pnl = (bot.cash - bot.initial_balance) + (bot.inventory * mid)
+            risk_engine.add_pnl(current_pnl)
+            
+            # Stop-Loss and Emergency Exit
+            if bot.is_stopped and abs(bot.inventory) > 0.0001:
+                side = lob.Side.SELL if bot.inventory > 0 else lob.Side.BUY
+                bot.on_trade(side, mid, abs(bot.inventory))
+                bot.inventory = 0
+                current_pnl = (bot.cash - bot.initial_balance)
 
-        # 4. Calculate P&L and Risk Metrics
-        # P&L Calculation
-        current_pnl = (bot.cash - bot.initial_balance) + (bot.inventory * mid)
-        risk_engine.add_pnl(current_pnl)
-        
-        # Stop-Loss and Emergency Exit
-        if bot.is_stopped and abs(bot.inventory) > 0.0001:
-            side = lob.Side.SELL if bot.inventory > 0 else lob.Side.BUY
-            bot.on_trade(side, mid, abs(bot.inventory))
-            bot.inventory = 0
-            current_pnl = (bot.cash - bot.initial_balance)
+            # 5. Record Keeping
+            results_logger.log(i, mid, my_bid, my_ask, bot.inventory, current_pnl)
+            
+            # Non-blocking publish; the dashboard thread redraws at its own rate
+            dashboard.update(i, mid, bot.inventory, bot.cash, current_pnl, bot.last_ai_adj, quote_latency_ns)
+            if track_latency and i % 1000 == 0:
+                dashboard.publish_latency_report(bot.get_latency_report())
 
-        # 5. Record Keeping
-        results.append({
-            "step": i, 
-            "mid": mid, 
-            "inv": bot.inventory, 
-            "pnl": current_pnl, 
-            "bid": my_bid, 
-            "ask": my_ask
-        })
-        
-        if i % 20 == 0:
-            dashboard.update(i, mid, bot.inventory, bot.cash, current_pnl, bot.last_ai_adj)
-            logger.log(i, mid, my_bid, my_ask, bot.inventory, current_pnl)
+            if bot.is_stopped and abs(bot.inventory) < 0.0001:
+                finished = True
+                break
 
-        if bot.is_stopped and abs(bot.inventory) < 0.0001:
+        if finished:
             break
 
-    logger.save()
+    if track_latency:
+        dashboard.publish_latency_report(bot.get_latency_report())
+    dashboard.close()
+    results_logger.save()
+    if track_latency:
+        results_logger.save_latency_report(bot.get_latency_report())
     
     # --- REPORTING ---
     stats = risk_engine.calculate_metrics()
@@ -92,13 +102,14 @@ def run_real_backtest(file_path):
     print(f"🎯 Win Rate            : %{stats['win_rate']*100:.2f}")
     print("="*45 + "\n")
     
-    return results
+    return results_logger.filename
 
 if __name__ == "__main__":
-    csv_path = "data/binance_BTC_USDT_1m.csv"
+    csv_path = data_path("binance_BTC_USDT_1m.csv")
     if os.path.exists(csv_path):
-        backtest_results = run_real_backtest(csv_path)
-        if backtest_results:
-            plot_session(backtest_results)
+        results_path = run_real_backtest(csv_path)
+        if os.path.exists(results_path):
+            from scripts.visualizer import plot_telemetry
+            plot_telemetry(results_path)
     else:
         print(f"Error: {csv_path} file cannot be found!")
\ No newline at end of file
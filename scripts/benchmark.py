@@ -0,0 +1,429 @@
+import sys
+import os
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+import argparse
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+import numpy as np
+from data_stream import data_path
+
+BENCH_DIR = data_path("benchmarks")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+SEED = 1234
+
+
+def synthetic_ohlcv(n_bars, seed=SEED, start_price=30000.0):
+    """Seeded random-walk OHLCV frame in the download_data.py schema."""
+    import pandas as pd
+    rng = np.random.default_rng(seed)
+    close = start_price + np.cumsum(rng.normal(0.0, 5.0, n_bars))
+    spread = np.abs(rng.normal(0.0, 3.0, n_bars))
+    return pd.DataFrame({
+        'timestamp': np.arange(n_bars, dtype=np.int64) * 60_000,
+        'open': close, 'high': close + spread, 'low': close - spread, 'close': close,
+        'volume': 1.0, 'bid_qty': 1.0, 'ask_qty': 1.0,
+    })
+
+
+def _metric(value, unit, better):
+    return {"value": float(value), "unit": unit, "better": better}
+
+
+def _seed_all():
+    import torch
+    np.random.seed(SEED)
+    torch.manual_seed(SEED)
+
+
+def bench_quote_latency(scale):
+    """StoikovBot.calculate_quotes tick-to-quote latency with live LSTM inference."""
+    from strategy.stoikov_strategy import StoikovBot
+    from strategy.latency import LatencyHistogram
+    _seed_all()
+    prices = synthetic_ohlcv(int(2000 * scale))['close'].tolist()
+    bot = StoikovBot(gamma=0.1, sigma=0.002, k=1.5, stop_loss=-1e9)
+    hist = LatencyHistogram()
+    for p in prices:
+        t0 = time.perf_counter_ns()
+        bot.calculate_quotes(p, 1.0, 1.0)
+        hist.record(time.perf_counter_ns() - t0)
+    s = hist.summary()
+    return {
+        "p50_us": _metric(s["p50_us"], "us", "lower"),
+        "p99_us": _metric(s["p99_us"], "us", "lower"),
+        "ticks_per_sec": _metric(1e6 / s["mean_us"], "ticks/s", "higher"),
+    }
+
+
+def bench_orderbook(scale):
+    """OrderBook add / cancel / match throughput through the pybind11 bindings."""
+    import aegis_lob as lob
+    rng = np.random.default_rng(SEED)
+    n = int(50_000 * scale)
+    ob = lob.OrderBook()
+    ob.set_logging(False)  # The engine's per-event std::cout logging is not what we time
+    bid_px = (100.0 - rng.integers(1, 50, n) * 0.01).tolist()
+    ask_px = (100.0 + rng.integers(1, 50, n) * 0.01).tolist()
+    out = {}
+    t0 = time.perf_counter()
+    for i in range(n):
+        ob.add_order(lob.Order(2 * i + 1, bid_px[i], 10, lob.Side.BUY, i))
+        ob.add_order(lob.Order(2 * i + 2, ask_px[i], 10, lob.Side.SELL, i))
+    out["add_per_sec"] = _metric(2 * n / (time.perf_counter() - t0), "ops/s", "higher")
+
+    t0 = time.perf_counter()
+    for i in range(0, n, 2):
+        ob.cancel_order(2 * i + 1)
+    out["cancel_per_sec"] = _metric((n // 2) / (time.perf_counter() - t0), "ops/s", "higher")
+
+    # Aggressive orders that each sweep part of the resting ask side
+    t0 = time.perf_counter()
+    base = 2 * n + 10
+    for i in range(n // 10):
+        ob.add_order(lob.Order(base + i, 101.0, 25, lob.Side.BUY, i))
+    out["match_per_sec"] = _metric((n // 10) / (time.perf_counter() - t0), "ops/s", "higher")
+    return out
+
+
+def bench_levelbook(scale):
+    """LevelBook batched L2 update throughput (apply_updates) and per-call set_level."""
+    import aegis_lob as lob
+    rng = np.random.default_rng(SEED)
+    n = int(1_000_000 * scale)
+    sides = rng.integers(0, 2, n).astype(np.int8)
+    prices = np.where(sides == 0, 100.0 - rng.integers(1, 200, n) * 0.01, 100.0 + rng.integers(1, 200, n) * 0.01)
+    qtys = np.where(rng.random(n) < 0.2, 0.0, rng.uniform(0.1, 5.0, n))
+    book = lob.LevelBook()
+    t0 = time.perf_counter()
+    book.apply_updates(sides, prices, qtys)
+    batched = n / (time.perf_counter() - t0)
+
+    book.clear()
+    m = n // 10
+    side_objs = [lob.Side.BUY if s == 0 else lob.Side.SELL for s in sides[:m].tolist()]
+    px, qty = prices[:m].tolist(), qtys[:m].tolist()
+    t0 = time.perf_counter()
+    for i in range(m):
+        book.set_level(side_objs[i], px[i], qty[i])
+    single = m / (time.perf_counter() - t0)
+    return {
+        "apply_updates_per_sec": _metric(batched, "updates/s", "higher"),
+        "set_level_per_sec": _metric(single, "updates/s", "higher"),
+    }
+
+
+def bench_hawkes_replay(scale):
+    """OrderBook.apply_events throughput on bursty Hawkes order flow with a crash regime."""
+    import aegis_lob as lob
+    from scripts.hawkes_generator import generate_order_flow, feed_book
+    schedule = [("sideways", 300 * scale), ("crash", 30 * scale), ("moon", 30 * scale)]
+    t0 = time.perf_counter()
+    flow = generate_order_flow(schedule, seed=SEED)
+    gen = len(flow) / (time.perf_counter() - t0)
+    book = lob.OrderBook()
+    book.set_logging(False)
+    t0 = time.perf_counter()
+    feed_book(book, flow)
+    replay = len(flow) / (time.perf_counter() - t0)
+    return {
+        "generate_events_per_sec": _metric(gen, "events/s", "higher"),
+        "replay_events_per_sec": _metric(replay, "events/s", "higher"),
+    }
+
+
+def bench_bulk_cancel(scale):
+    """
+    Flattening our tagged ladder inside a deep book: one cancel_owner call vs a
+    Python loop of cancel_order, plus cancel_side throughput on the whole book.
+    """
+    import aegis_lob as lob
+    n = max(8, int(200_000 * scale))
+    # Our ladder: up to 100 adjacent (bid, ask) id pairs spread through the book, so
+    # both sides are tagged at any scale and untagged flow is left on both sides
+    pairs = max(1, min(100, n // 8))
+    stride = n // pairs
+    ours = [i for k in range(pairs) for i in (k * stride, k * stride + 1)]
+    tagged = set(ours)
+
+    def build():
+        book = lob.OrderBook()
+        book.set_logging(False)
+        for i in range(n):
+            side, sign = (lob.Side.BUY, -1) if i % 2 == 0 else (lob.Side.SELL, 1)
+            book.add_order(lob.Order(i, 100.0 + sign * (1 + i % 500) * 0.01, 10, side, i, 7 if i in tagged else 0))
+        return book
+
+    # The first id-array return pays pybind11's one-off NumPy setup; keep it out of the timing
+    warm = lob.OrderBook()
+    warm.set_logging(False)
+    warm.cancel_owner(7)
+    del warm
+
+    book = build()
+    t0 = time.perf_counter()
+    ids, _ = book.cancel_owner(7)
+    bulk = time.perf_counter() - t0
+    if len(ids) != len(ours):
+        raise RuntimeError(f"bulk_cancel: cancel_owner removed {len(ids)} of {len(ours)} tagged orders")
+    t0 = time.perf_counter()
+    bid_ids, _ = book.cancel_side(lob.Side.BUY)
+    ask_ids, _ = book.cancel_side(lob.Side.SELL)
+    side = (len(bid_ids) + len(ask_ids)) / (time.perf_counter() - t0)
+    if not (len(bid_ids) and len(ask_ids)):
+        raise RuntimeError("bulk_cancel: cancel_side found an empty side")
+    del book
+
+    book = build()
+    t0 = time.perf_counter()
+    for oid in ours:
+        book.cancel_order(oid)
+    single = time.perf_counter() - t0
+    del book
+    return {
+        "cancel_owner_us": _metric(bulk * 1e6, "us", "lower"),
+        "cancel_order_loop_us": _metric(single * 1e6, "us", "lower"),
+        "cancel_side_per_sec": _metric(side, "orders/s", "higher"),
+    }
+
+
+def bench_backtest(scale):
+    """Headless backtest bars/sec, with per-bar inference and with precomputed features."""
+    from scripts.optimizer import run_headless_backtest
+    from strategy.feature_cache import load_signal_model, compute_features
+    _seed_all()
+    df = synthetic_ohlcv(int(2000 * scale))
+    t0 = time.perf_counter()
+    run_headless_backtest(df, 0.1, 0.002, 0.6)
+    live = len(df) / (time.perf_counter() - t0)
+
+    features = compute_features(df['close'].to_numpy(), load_signal_model())
+    t0 = time.perf_counter()
+    run_headless_backtest(df, 0.1, 0.002, 0.6, features)
+    cached = len(df) / (time.perf_counter() - t0)
+    return {
+        "bars_per_sec": _metric(live, "bars/s", "higher"),
+        "bars_per_sec_features": _metric(cached, "bars/s", "higher"),
+    }
+
+
+def bench_optimizer(scale):
+    """Optimizer grid throughput (runs/sec) with shared precomputed features."""
+    import itertools
+    from scripts.optimizer import run_headless_backtest
+    from strategy.feature_cache import load_signal_model, compute_features
+    _seed_all()
+    df = synthetic_ohlcv(int(1000 * scale))
+    t0 = time.perf_counter()
+    features = compute_features(df['close'].to_numpy(), load_signal_model())
+    grid = list(itertools.product([0.1, 0.2], [0.002, 0.005], [0.3, 0.9]))
+    for g, s, a in grid:
+        run_headless_backtest(df, g, s, a, features)
+    return {"runs_per_sec": _metric(len(grid) / (time.perf_counter() - t0), "runs/s", "higher")}
+
+
+def bench_risk_analyzer(scale):
+    """RiskAnalyzer add_pnl + calculate_metrics cost, list-backed and streaming."""
+    from strategy.risk_analyzer import RiskAnalyzer
+    rng = np.random.default_rng(SEED)
+    pnl = np.cumsum(rng.normal(0.0, 1.0, int(200_000 * scale))).tolist()
+    out = {}
+    for label, streaming in (("list", False), ("streaming", True)):
+        ra = RiskAnalyzer(streaming=streaming)
+        t0 = time.perf_counter()
+        for p in pnl:
+            ra.add_pnl(p)
+        ra.calculate_metrics()
+        out[f"{label}_ns_per_bar"] = _metric((time.perf_counter() - t0) / len(pnl) * 1e9, "ns", "lower")
+    return out
+
+
+def bench_lstm(scale):
+    """LSTM inference: single-window latency and batched windows/sec."""
+    import torch
+    from strategy.ai_model import PricePredictorLSTM
+    _seed_all()
+    model = PricePredictorLSTM().eval()
+    single = torch.rand(1, 50, 1)
+    batch = torch.rand(4096, 50, 1)
+    reps = max(1, int(300 * scale))
+    with torch.no_grad():
+        model(single)
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            model(single)
+        single_us = (time.perf_counter() - t0) / reps * 1e6
+        t0 = time.perf_counter()
+        model(batch)
+        batched = len(batch) / (time.perf_counter() - t0)
+    return {
+        "single_us": _metric(single_us, "us", "lower"),
+        "batched_windows_per_sec": _metric(batched, "windows/s", "higher"),
+    }
+
+
+def _python_ms(code, *args):
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code, *args], cwd=project_root, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - t0) * 1e3
+
+
+def bench_startup(scale):
+    """
+    Cold-start cost of the `aegis` CLI in fresh interpreters: bare interpreter,
+    `aegis --help`, and the import cost of each subcommand's module on top of it.
+    """
+    from aegis_cli import COMMAND_MODULES
+    bare = _python_ms("pass")
+    out = {
+        "interpreter_ms": _metric(bare, "ms", "lower"),
+        "cli_help_ms": _metric(_python_ms("import sys, aegis_cli; sys.argv = ['aegis', '--help']\n"
+                                          "try: aegis_cli.main()\nexcept SystemExit: pass") - bare, "ms", "lower"),
+    }
+    for name in COMMAND_MODULES:
+        ms = _python_ms("import sys, aegis_cli; aegis_cli.import_command(sys.argv[1])", name) - bare
+        out[f"{name}_import_ms"] = _metric(ms, "ms", "lower")
+    return out
+
+
+BENCHMARKS = {
+    "quote_latency": bench_quote_latency,
+    "orderbook": bench_orderbook,
+    "levelbook": bench_levelbook,
+    "hawkes_replay": bench_hawkes_replay,
+    "bulk_cancel": bench_bulk_cancel,
+    "backtest": bench_backtest,
+    "optimizer": bench_optimizer,
+    "risk_analyzer": bench_risk_analyzer,
+    "lstm": bench_lstm,
+    "startup": bench_startup,
+}
+
+
+def machine_metadata():
+    import torch
+    import pandas as pd
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=project_root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": commit,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "torch": torch.__version__,
+        "torch_threads": torch.get_num_threads(),
+    }
+
+
+def run_suite(names=None, scale=1.0, repeats=3):
+    """
+    Runs the selected workloads `repeats` times and keeps the best value of each
+    metric (highest throughput / lowest latency) to damp scheduler noise.
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        print(f"⏱️  {name} ...", flush=True)
+        best = {}
+        for _ in range(repeats):
+            for metric, m in BENCHMARKS[name](scale).items():
+                prev = best.get(metric)
+                if prev is None or (m["value"] > prev["value"]) == (m["better"] == "higher"):
+                    best[metric] = m
+        for metric, m in best.items():
+            results[f"{name}.{metric}"] = m
+            print(f"   {metric:<28}{m['value']:>16.2f} {m['unit']}")
+    return {"metadata": machine_metadata(), "scale": scale, "results": results}
+
+
+def compare(baseline, current, threshold_pct):
+    """
+    Prints per-metric change versus the baseline and returns the metrics that
+    got worse by more than threshold_pct in their 'better' direction, plus any
+    baseline metric the current run did not produce. Runs recorded at different
+    --scale values are not comparable and raise ValueError.
+    """
+    if baseline.get("scale") != current.get("scale"):
+        raise ValueError(f"baseline was recorded at --scale {baseline.get('scale')}, "
+                         f"current run at --scale {current.get('scale')}")
+    regressions = []
+    print(f"{'metric':<44}{'baseline':>14}{'current':>14}{'change':>10}")
+    for key, cur in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None or base["value"] == 0:
+            print(f"{key:<44}{'-':>14}{cur['value']:>14.2f}{'new':>10}")
+            continue
+        change = (cur["value"] - base["value"]) / base["value"] * 100.0
+        worse = -change if cur["better"] == "higher" else change
+        flag = "  ❌ REGRESSION" if worse > threshold_pct else ""
+        if flag:
+            regressions.append(key)
+        print(f"{key:<44}{base['value']:>14.2f}{cur['value']:>14.2f}{change:>+9.1f}%{flag}")
+    for key, base in baseline["results"].items():
+        if key not in current["results"]:
+            print(f"{key:<44}{base['value']:>14.2f}{'-':>14}{'missing':>10}  ❌ REGRESSION")
+            regressions.append(key)
+    if baseline.get("metadata", {}).get("platform") != current.get("metadata", {}).get("platform"):
+        print("⚠️ [WARNING] Baseline was recorded on a different platform; compare with care.")
+    return regressions
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aegis-LOB benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="run the benchmark workloads")
+    run_p.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="subset of workloads")
+    run_p.add_argument("--scale", type=float, default=1.0, help="workload size multiplier")
+    run_p.add_argument("--repeats", type=int, default=3)
+    run_p.add_argument("--out", help="result file (default: <data dir>/benchmarks/<timestamp>.json)")
+    run_p.add_argument("--save-baseline", action="store_true", help="also store as the baseline")
+
+    cmp_p = sub.add_parser("compare", help="compare a result file against a baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--baseline", default=BASELINE_PATH)
+    cmp_p.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        report = run_suite(args.only, args.scale, args.repeats)
+        out = args.out or os.path.join(BENCH_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + ".json")
+        targets = [out] + ([BASELINE_PATH] if args.save_baseline else [])
+        for path in targets:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"--- ✅ BENCHMARK RESULTS SAVED: {path} ---")
+        return 0
+
+    try:
+        regressions = compare(_load(args.baseline), _load(args.current), args.threshold)
+    except ValueError as e:
+        print(f"❌ ERROR: {e}")
+        return 2
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold}%: {', '.join(regressions)}")
+        return 1
+    print(f"\n✅ No regressions beyond {args.threshold}%.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,7 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
 if project_root not in sys.path:
     sys.path.append(project_root)
+from data_stream import data_dir
 
 def fetch_binance_data(symbol='BTC/USDT', timeframe='1m', limit=1000):
     """
@@ -35,12 +36,12 @@ def fetch_binance_data(symbol='BTC/USDT', timeframe='1m', limit=1000):
         df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
         
         # 4. Directory and File Path Management
-        if not os.path.exists("data"):
-            os.makedirs("data")
-            print("[INFO] 'data/' directory created.")
+        if not os.path.exists(data_dir()):
+            os.makedirs(data_dir())
+            print(f"[INFO] '{data_dir()}/' directory created.")
             
         file_name = f"binance_{symbol.replace('/', '_')}_{timeframe}.csv"
-        file_path = os.path.join("data", file_name)
+        file_path = os.path.join(data_dir(), file_name)
         
         # 5. Export to CSV
         df.to_csv(file_path, index=False)
@@ -4,41 +4,24 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
 if project_root not in sys.path:
     sys.path.append(project_root)
-import ccxt
-import pandas as pd
-from datetime import datetime
+from scripts.historical_downloader import HistoricalDownloader
+from data_stream import data_dir
 
-def download_binance_data(symbol, timeframe, start_str, end_str, filename):
+def download_binance_data(symbol, timeframe, start_str, end_str, filename, max_workers=4):
     """
     Downloads historical OHLCV data from Binance.
+    Segments are fetched concurrently within Binance's rate limit, staged on disk
+    for resume, and only ranges missing from an existing file are requested.
     Mocks Bid/Ask quantities as 1.0 for Stoikov backtesting compatibility.
     """
-    exchange = ccxt.binance()
-    start_ts = exchange.parse8601(start_str)
-    end_ts = exchange.parse8601(end_str)
-    
-    print(f"📥 Downloading: {filename}...")
-    all_ohlcv = []
-    
-    while start_ts < end_ts:
-        ohlcv = exchange.fetch_ohlcv(symbol, timeframe, start_ts, limit=1000)
-        if not ohlcv: break
-        start_ts = ohlcv[-1][0] + 1
-        all_ohlcv.extend(ohlcv)
-        if len(ohlcv) < 1000: break
-
-    df = pd.DataFrame(all_ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-    
-    # Expected format: Historical OHLCV does not include LOB imbalance (OBI).
-    # We mock bid_qty and ask_qty as 1.0 for backtest consistency.
-    df['bid_qty'] = 1.0
-    df['ask_qty'] = 1.0
-    
-    os.makedirs('data', exist_ok=True)
-    df.to_csv(f"data/{filename}", index=False)
-    print(f"✅ Saved Successfully: data/{filename}")
+    import ccxt
+    # Request spacing is handled by the downloader's shared limiter
+    exchange = ccxt.binance({'enableRateLimit': False})
+    downloader = HistoricalDownloader(exchange, data_dir=data_dir(), max_workers=max_workers)
+    return downloader.download(symbol, timeframe, start_str, end_str, filename)
 
-if __name__ == "__main__":
+def download_scenarios():
+    """Fetches the three regime datasets used by stress_tester.py."""
     # 1. CRASH SCENARIO: August 2024 Nikkei Shock (Extreme Downtrend)
     download_binance_data('BTC/USDT', '1m', '2024-08-05T00:00:00Z', '2024-08-06T00:00:00Z', 'binance_BTC_USDT_crash.csv')
     
@@ -46,4 +29,8 @@ if __name__ == "__main__":
     download_binance_data('BTC/USDT', '1m', '2024-11-06T00:00:00Z', '2024-11-08T00:00:00Z', 'binance_BTC_USDT_moon.csv')
     
     # 3. SIDEWAYS SCENARIO: September 2024 Consolidation (Sideways Market)
-    download_binance_data('BTC/USDT', '1m', '2024-09-15T00:00:00Z', '2024-09-17T00:00:00Z', 'binance_BTC_USDT_sideways.csv')
\ No newline at end of file
+    download_binance_data('BTC/USDT', '1m', '2024-09-15T00:00:00Z', '2024-09-17T00:00:00Z', 'binance_BTC_USDT_sideways.csv')
+
+
+if __name__ == "__main__":
+    download_scenarios()
@@ -0,0 +1,317 @@
+import sys
+import os
+# Project root setup for relative imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+import argparse
+import time
+from collections import namedtuple
+import numpy as np
+
+# Event-type axis of the Hawkes process (intensity vector / branching matrix index)
+ADD_BID, ADD_ASK, CANCEL_BID, CANCEL_ASK, MKT_BUY, MKT_SELL = range(6)
+N_TYPES = 6
+TYPE_NAMES = ("add_bid", "add_ask", "cancel_bid", "cancel_ask", "mkt_buy", "mkt_sell")
+
+# OrderBook.apply_events encoding (EventKind in OrderBook.hpp; sides follow aegis_lob.Side)
+EVENT_ADD, EVENT_CANCEL, EVENT_MARKET = 0, 1, 2
+SIDE_BUY, SIDE_SELL = 0, 1
+_TYPE_KIND = np.array([EVENT_ADD, EVENT_ADD, EVENT_CANCEL, EVENT_CANCEL, EVENT_MARKET, EVENT_MARKET], dtype=np.int8)
+_TYPE_SIDE = np.array([SIDE_BUY, SIDE_SELL, SIDE_BUY, SIDE_SELL, SIDE_BUY, SIDE_SELL], dtype=np.int8)
+
+# One order-flow event. `ref` is the latent reference price the flow was placed around
+# and `regime` indexes the schedule; both are ignored by the engine.
+EVENT_DTYPE = np.dtype([
+    ("ts_ns", "<i8"),
+    ("kind", "i1"),
+    ("side", "i1"),
+    ("regime", "<i2"),
+    ("qty", "<u4"),
+    ("order_id", "<u8"),
+    ("price", "<f8"),
+    ("ref", "<f8"),
+])
+
+# mu: baseline intensity per event type (events/s)
+# branching: expected children of type i spawned by one event of type j (spectral radius < 1)
+# decay: exponential kernel rate (1/s); impact_ticks: reference-price move per market order
+Regime = namedtuple("Regime", "mu branching decay impact_ticks")
+
+
+def _regime(mu, excite, decay=20.0, impact_ticks=0.3):
+    branching = np.zeros((N_TYPES, N_TYPES))
+    for (child, parent), ratio in excite.items():
+        branching[child, parent] = ratio
+    return Regime(np.asarray(mu, dtype=np.float64), branching, decay, impact_ticks)
+
+
+# Shared excitation pattern: market orders trigger follow-on market orders on the
+# same side, refills on the side they hit and cancels of the quotes they threaten.
+_BASE_EXCITE = {
+    (MKT_BUY, MKT_BUY): 0.35, (MKT_SELL, MKT_SELL): 0.35,
+    (ADD_ASK, MKT_BUY): 0.5, (ADD_BID, MKT_SELL): 0.5,
+    (CANCEL_ASK, MKT_BUY): 0.2, (CANCEL_BID, MKT_SELL): 0.2,
+    (ADD_BID, ADD_BID): 0.2, (ADD_ASK, ADD_ASK): 0.2,
+}
+
+REGIMES = {
+    "sideways": _regime([60, 60, 45, 45, 6, 6], _BASE_EXCITE),
+    # Sell-side cascade: heavy self-exciting market selling, bids pulled, little refill
+    "crash": _regime([30, 70, 80, 30, 4, 30], {
+        **_BASE_EXCITE, (MKT_SELL, MKT_SELL): 0.75, (CANCEL_BID, MKT_SELL): 0.6, (ADD_BID, MKT_SELL): 0.1,
+    }, decay=40.0, impact_ticks=0.25),
+    # Mirror image: buy-side squeeze
+    "moon": _regime([70, 30, 30, 80, 30, 4], {
+        **_BASE_EXCITE, (MKT_BUY, MKT_BUY): 0.75, (CANCEL_ASK, MKT_BUY): 0.6, (ADD_ASK, MKT_BUY): 0.1,
+    }, decay=40.0, impact_ticks=0.25),
+}
+
+
+def simulate_hawkes(mu, branching, decay, duration_s, rng):
+    """
+    Multivariate Hawkes process with exponential kernels via its cluster (branching)
+    representation: Poisson immigrants at rate mu, then each generation's children
+    are drawn for all parents at once. Returns (times_s, types) sorted by time.
+    """
+    if np.max(np.abs(np.linalg.eigvals(branching))) >= 1.0:
+        raise ValueError("branching matrix is explosive (spectral radius >= 1)")
+    counts = rng.poisson(mu * duration_s)
+    gen_t = rng.uniform(0.0, duration_s, counts.sum())
+    gen_k = np.repeat(np.arange(N_TYPES), counts)
+    times, types = [gen_t], [gen_k]
+    while gen_t.size:
+        n_child = rng.poisson(branching[:, gen_k].T).ravel()  # (parent, child type) flattened
+        total = int(n_child.sum())
+        if total == 0:
+            break
+        parent = np.repeat(np.repeat(np.arange(gen_t.size), N_TYPES), n_child)
+        child_k = np.repeat(np.tile(np.arange(N_TYPES), gen_t.size), n_child)
+        child_t = gen_t[parent] + rng.exponential(1.0 / decay, total)
+        keep = child_t < duration_s
+        gen_t, gen_k = child_t[keep], child_k[keep]
+        times.append(gen_t)
+        types.append(gen_k)
+    t = np.concatenate(times)
+    k = np.concatenate(types)
+    order = np.argsort(t, kind="stable")
+    return t[order], k[order]
+
+
+def generate_order_flow(schedule, start_price=100.0, tick_size=0.01, level_p=0.3, mean_qty=5.0,
+                        mean_mkt_qty=8.0, cancel_recent_p=0.05, seed=7, regimes=REGIMES):
+    """
+    Builds an EVENT_DTYPE stream for a regime schedule [(name, seconds), ...].
+    - Adds sit k >= 1 ticks behind the reference price, k ~ Geometric(level_p).
+    - Cancels target one of that side's earlier adds, biased to recent ones
+      (ids that already traded are ignored by the engine).
+    - Market orders are IOC and push the reference price by the regime's impact.
+    Order ids are 1..n in stream order.
+    """
+    rng = np.random.default_rng(seed)
+    t_parts, k_parts, r_parts = [], [], []
+    offset = 0.0
+    for idx, (name, seconds) in enumerate(schedule):
+        reg = regimes[name]
+        t, k = simulate_hawkes(reg.mu, reg.branching, reg.decay, seconds, rng)
+        t_parts.append(t + offset)
+        k_parts.append(k)
+        r_parts.append(np.full(t.size, idx, dtype=np.int16))
+        offset += seconds
+    t = np.concatenate(t_parts)
+    k = np.concatenate(k_parts)
+    regime_idx = np.concatenate(r_parts)
+    n = t.size
+
+    events = np.zeros(n, dtype=EVENT_DTYPE)
+    events["ts_ns"] = (t * 1e9).astype(np.int64)
+    events["kind"] = _TYPE_KIND[k]
+    events["side"] = _TYPE_SIDE[k]
+    events["regime"] = regime_idx
+    events["order_id"] = np.arange(1, n + 1, dtype=np.uint64)
+
+    # 1. Reference price: cumulative market-order impact, snapped to the tick grid
+    impact = np.array([regimes[name].impact_ticks for name, _ in schedule])[regime_idx]
+    sign = np.where(k == MKT_BUY, 1.0, np.where(k == MKT_SELL, -1.0, 0.0))
+    ref = start_price + tick_size * np.cumsum(sign * impact * rng.random(n) * 2.0)
+    ref = np.maximum(np.round(ref / tick_size) * tick_size, tick_size)
+    events["ref"] = ref
+
+    # 2. Limit prices and sizes
+    is_add = (k == ADD_BID) | (k == ADD_ASK)
+    levels = rng.geometric(level_p, n)
+    events["price"] = np.where(k == ADD_BID, ref - levels * tick_size,
+                               np.where(k == ADD_ASK, ref + levels * tick_size, 0.0))
+    events["price"] = np.maximum(events["price"], np.where(is_add, tick_size, 0.0))
+    qty = np.where(k >= MKT_BUY, rng.geometric(1.0 / mean_mkt_qty, n), rng.geometric(1.0 / mean_qty, n))
+    events["qty"] = np.where(k == CANCEL_BID, 0, np.where(k == CANCEL_ASK, 0, qty))
+
+    # 3. Cancel targets: the j-th most recent earlier add on the same side, j ~ Geometric
+    for add_type, cancel_type in ((ADD_BID, CANCEL_BID), (ADD_ASK, CANCEL_ASK)):
+        add_pos = np.flatnonzero(k == add_type)
+        cancel_pos = np.flatnonzero(k == cancel_type)
+        n_prior = np.searchsorted(add_pos, cancel_pos)
+        back = np.minimum(rng.geometric(cancel_recent_p, cancel_pos.size), np.maximum(n_prior, 1))
+        valid = n_prior > 0
+        target = add_pos[np.maximum(n_prior - back, 0)[valid]] if add_pos.size else np.empty(0, dtype=np.int64)
+        events["order_id"][cancel_pos[valid]] = events["order_id"][target]
+        events["kind"][cancel_pos[~valid]] = -1  # Nothing to cancel yet
+
+    return events[events["kind"] >= 0]
+
+
+def feed_book(book, events, batch_size=65_536):
+    """Replays an event stream into an OrderBook with apply_events in batches; returns executed qty."""
+    executed = 0
+    for s in range(0, len(events), batch_size):
+        e = events[s:s + batch_size]
+        executed += book.apply_events(e["kind"], e["side"], e["order_id"], e["price"], e["qty"], e["ts_ns"])
+    return executed
+
+
+def stress_strategy(events, schedule, interval_s=0.05, tick_size=0.01, bot=None):
+    """
+    Drives StoikovBot off the live engine: the flow is applied in interval_s slices,
+    then the bot quotes from get_analytics() (mid and real L1 quantities) through a
+    QuoteManager into the same book. Our quotes are owner-tagged orders that queue
+    behind the flow at their level and fill only when Hawkes market orders or
+    crossing adds actually trade against them, so queue position and adverse
+    selection are part of the result.
+    """
+    import aegis_lob as lob
+    from strategy.stoikov_strategy import StoikovBot
+    from strategy.order_manager import QuoteManager
+    from strategy.latency import LatencyRecorder, TimedOrderBook
+
+    book = lob.OrderBook()
+    book.set_logging(False)
+    book.set_cycle_sampling(64)
+    # Python-side book calls (analytics, quotes, fill checks) are timed per method;
+    # the bulk apply_events call is timed separately as engine throughput
+    latency = LatencyRecorder()
+    timed_book = TimedOrderBook(book, latency)
+    bot = bot or StoikovBot(gamma=0.1, sigma=0.002, k=1.5, stop_loss=-500.0)
+    sim_clock = [0.0]
+    # Our ids start above the flow's so its cancels can never hit our quotes
+    first_id = int(events["order_id"].max()) + 1 if len(events) else 1
+    manager = QuoteManager(timed_book, tick_size=tick_size, clock=lambda: sim_clock[0], first_id=first_id)
+
+    edges = []
+    if len(events):
+        edges = np.searchsorted(events["ts_ns"], np.arange(0, events["ts_ns"][-1] + 1, int(interval_s * 1e9)))
+        edges = np.append(edges[1:], len(events))
+    regime_names = [name for name, _ in schedule]
+    per_regime = {name: {"slices": 0, "pnl_change": 0.0, "fills": 0, "filled_qty": 0.0} for name in regime_names}
+    engine_ns = 0
+    pnl = peak = 0.0
+    max_dd = 0.0
+    start = 0
+    for end in edges:
+        if end <= start:
+            continue
+        batch = events[start:end]
+        start = end
+        t0 = time.perf_counter_ns()
+        book.apply_events(batch["kind"], batch["side"], batch["order_id"], batch["price"], batch["qty"], batch["ts_ns"])
+        engine_ns += time.perf_counter_ns() - t0
+        sim_clock[0] = batch["ts_ns"][-1] / 1e9
+
+        a = timed_book.get_analytics()
+        if a.mid == 0.0:
+            continue
+        regime = per_regime[regime_names[batch["regime"][-1]]]
+        fills_before = manager.fills
+        for side, price, qty in manager.engine_fills():
+            bot.on_trade(side, price, qty)
+            regime["filled_qty"] += qty
+        if not bot.is_stopped:
+            bid, ask, qty = bot.calculate_quotes(a.mid, a.best_bid_qty, a.best_ask_qty)
+            if bot.is_stopped:
+                manager.cancel_all()
+            else:
+                manager.update(bid, ask, qty)
+
+        new_pnl = (bot.cash - bot.initial_balance) + bot.inventory * a.mid
+        regime["slices"] += 1
+        regime["pnl_change"] += new_pnl - pnl
+        regime["fills"] += manager.fills - fills_before
+        pnl = new_pnl
+        peak = max(peak, pnl)
+        max_dd = max(max_dd, peak - pnl)
+
+    return {
+        "events": len(events),
+        "engine_events_per_sec": len(events) / (engine_ns / 1e9) if engine_ns else 0.0,
+        "final_pnl": pnl,
+        "max_drawdown": max_dd,
+        "inventory": bot.inventory,
+        "stopped": bot.is_stopped,
+        "orders": manager.stats(),
+        "engine": book.get_stats().to_dict(),
+        "regimes": per_regime,
+        "latency": latency.report(),
+    }
+
+
+def parse_schedule(text):
+    """'sideways:60,crash:10,moon:20' -> [('sideways', 60.0), ('crash', 10.0), ('moon', 20.0)]"""
+    schedule = []
+    for part in text.split(","):
+        name, seconds = part.split(":")
+        if name not in REGIMES:
+            raise ValueError(f"unknown regime '{name}' (choose from {', '.join(REGIMES)})")
+        schedule.append((name, float(seconds)))
+    return schedule
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hawkes order-flow generator and engine/strategy stress test")
+    parser.add_argument("--schedule", default="sideways:120,crash:15,sideways:60,moon:15,sideways:60")
+    parser.add_argument("--start-price", type=float, default=100.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save", help="write the generated stream to this .npy file")
+    args = parser.parse_args()
+
+    schedule = parse_schedule(args.schedule)
+    t0 = time.perf_counter()
+    flow = generate_order_flow(schedule, start_price=args.start_price, seed=args.seed)
+    gen_s = time.perf_counter() - t0
+    kinds = np.bincount(flow["kind"], minlength=3)
+    print(f"--- ✅ GENERATED {len(flow):,} EVENTS in {gen_s:.2f}s "
+          f"(adds: {kinds[EVENT_ADD]:,} | cancels: {kinds[EVENT_CANCEL]:,} | markets: {kinds[EVENT_MARKET]:,}) ---")
+    if args.save:
+        np.save(args.save, flow)
+        print(f"--- ✅ STREAM SAVED: {args.save} ---")
+
+    report = stress_strategy(flow, schedule)
+    print("\n" + "="*60)
+    print("      AEGIS-LOB: HAWKES STRESS REPORT")
+    print("="*60)
+    print(f"{'engine throughput':<22}: {report['engine_events_per_sec']:>14,.0f} events/s")
+    print(f"{'final PnL':<22}: {report['final_pnl']:>14.2f}")
+    print(f"{'max drawdown':<22}: {report['max_drawdown']:>14.2f}")
+    print(f"{'inventory':<22}: {report['inventory']:>14.4f}")
+    print(f"{'risk lock':<22}: {'ENGAGED' if report['stopped'] else 'clear':>14}")
+    orders = report["orders"]
+    print(f"{'quote fills':<22}: {orders['fills']:>14,} ({orders['messages']:,} messages)")
+    print("-"*60)
+    eng = report["engine"]
+    unit = "cycles" if eng["cycles_are_tsc"] else "ns"
+    print(f"{'resting / peak':<22}: {eng['resting_orders']:>14,} / {eng['peak_resting_orders']:,}")
+    print(f"{'levels created/erased':<22}: {eng['levels_created']:>14,} / {eng['levels_erased']:,}")
+    print(f"{'unknown-id cancels':<22}: {eng['cancels_unknown']:>14,} of {eng['cancels_requested']:,}")
+    print(f"{'book memory (est.)':<22}: {eng['estimated_bytes'] / 1024:>14,.1f} KiB")
+    for op in ("add", "cancel", "market"):
+        c = eng[f"{op}_cycles"]
+        print(f"{op + ' cost (sampled)':<22}: {c['mean']:>14,.0f} {unit} mean | {c['max']:,} max")
+    print("-"*60)
+    print(f"{'Python book call':<26}{'p50 us':>10}{'p99 us':>12}{'max us':>12}")
+    for stage, st in report["latency"].items():
+        if st.get("count"):
+            print(f"{stage:<26}{st['p50_us']:>10.1f}{st['p99_us']:>12.1f}{st['max_us']:>12.1f}")
+    print("-"*60)
+    for name, st in report["regimes"].items():
+        print(f"{name:<12} slices: {st['slices']:>6} | fills: {st['fills']:>5} ({st['filled_qty']:.3f}) "
+              f"| PnL change: {st['pnl_change']:>10.2f}")
+    print("="*60)
@@ -6,11 +6,11 @@ project_root = os.path.dirname(current_dir)
 if project_root not in sys.path:
     sys.path.append(project_root)
 import numpy as np
-import matplotlib.pyplot as plt
 import aegis_lob as lob
 from strategy.stoikov_strategy import StoikovBot
 from data_logger import DataLogger
-from dashboard import LiveRiskDashboard
+from dashboard import ThreadedRiskDashboard
+from scripts.visualizer import lttb_downsample, minmax_downsample
 
 
 
@@ -20,7 +20,7 @@ def run_final_grand_simulation(steps=10000, start_price=100.0, sigma=0.05, drift
     """
     # 1. Initialization
     logger = DataLogger("grand_simulation_final.csv")
-    dashboard = LiveRiskDashboard()
+    dashboard = ThreadedRiskDashboard()
     
     # Champion parameters: Gamma=0.15, Sigma adjusted for 10k steps
     bot = StoikovBot(gamma=0.15, sigma=sigma, k=1.5, stop_loss=-250.0, comm_rate=0.0005)
@@ -63,31 +63,33 @@ def run_final_grand_simulation(steps=10000, start_price=100.0, sigma=0.05, drift
         pnls.append(current_pnl)
         invs.append(bot.inventory)
         
-        if i % 100 == 0:
-            dashboard.update(i, current_price, bot.inventory, bot.cash, current_pnl, getattr(bot, 'last_ai_adj', 0.0))
+        dashboard.update(i, current_price, bot.inventory, bot.cash, current_pnl, getattr(bot, 'last_ai_adj', 0.0))
 
     # 7. Persistence
+    dashboard.close()
     logger.save()
     print(f"--- ✅ SIMULATION FINISHED. Final P&L: {current_pnl:.2f} ---")
     return prices, pnls, invs
 
-if __name__ == "__main__":
-    # RUN SIMULATION
-    raw_prices, raw_pnls, raw_invs = run_final_grand_simulation()
-    
+
+def plot_simulation_report(raw_prices, raw_pnls, raw_invs):
+    """Three-panel price / equity / inventory report for a finished simulation."""
+    import matplotlib.pyplot as plt
     # --- GRAPHING FIX: SYNCING LIST LENGTHS ---
     # Ensure all lists match the actual steps executed before the stop-loss
     actual_steps = len(raw_pnls)
     steps_range = np.arange(actual_steps)
-    prices = raw_prices[:actual_steps]
-    pnls = raw_pnls
-    invs = raw_invs
+
+    # Reduce each series to screen resolution before drawing (1400px wide figure)
+    price_x, prices = lttb_downsample(steps_range, raw_prices[:actual_steps], 2800)
+    pnl_x, pnls = lttb_downsample(steps_range, raw_pnls, 2800)
+    inv_x, invs = minmax_downsample(steps_range, raw_invs, 1400)
 
     plt.figure(figsize=(14, 12), facecolor='#f7f7f7')
     
     # Subplot 1: BTC Mid-Price
     plt.subplot(3, 1, 1)
-    plt.plot(steps_range, prices, color='#1f77b4', linewidth=1.5, label='BTC Mid-Price')
+    plt.plot(price_x, prices, color='#1f77b4', linewidth=1.5, label='BTC Mid-Price')
     plt.title(f'Aegis-LOB: Performance Report (Terminated at Step {actual_steps-1})', fontsize=14, fontweight='bold')
     plt.ylabel('Price (USDT)')
     plt.grid(True, alpha=0.3, linestyle='--')
@@ -95,8 +97,8 @@ if __name__ == "__main__":
 
     # Subplot 2: Equity Curve (Net P&L)
     plt.subplot(3, 1, 2)
-    plt.fill_between(steps_range, pnls, 10000, color='green', alpha=0.2)
-    plt.plot(steps_range, pnls, color='darkgreen', linewidth=2, label='Total Equity (Cash + Position)')
+    plt.fill_between(pnl_x, pnls, 10000, color='green', alpha=0.2)
+    plt.plot(pnl_x, pnls, color='darkgreen', linewidth=2, label='Total Equity (Cash + Position)')
     plt.axhline(10000, color='red', linestyle='--', linewidth=1, label='Break-even')
     plt.ylabel('Equity (USDT)')
     plt.grid(True, alpha=0.3, linestyle='--')
@@ -104,7 +106,7 @@ if __name__ == "__main__":
 
     # Subplot 3: Inventory Exposure
     plt.subplot(3, 1, 3)
-    plt.step(steps_range, invs, color='#ff7f0e', linewidth=1.5, label='Inventory (BTC)')
+    plt.step(inv_x, invs, where='post', color='#ff7f0e', linewidth=1.5, label='Inventory (BTC)')
     plt.axhline(0, color='black', linewidth=0.8)
     plt.ylabel('Units')
     plt.xlabel('Simulation Steps')
@@ -112,4 +114,10 @@ if __name__ == "__main__":
     plt.legend()
 
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+
+if __name__ == "__main__":
+    # RUN SIMULATION
+    raw_prices, raw_pnls, raw_invs = run_final_grand_simulation()
+    plot_simulation_report(raw_prices, raw_pnls, raw_invs)
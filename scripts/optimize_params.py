@@ -9,6 +9,7 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
 if project_root not in sys.path:
     sys.path.append(project_root)
+from data_stream import data_path
 
 # CRITICAL FIX: Importing the correct function name
 from scripts.monte_carlo_test import run_final_grand_simulation
@@ -63,7 +64,7 @@ def start_parameter_optimization():
         print("="*50)
 
         # Save logs for research documentation
-        df_results.to_csv("data/optimization_results.csv", index=False)
+        df_results.to_csv(data_path("optimization_results.csv"), index=False)
     else:
         print("❌ ERROR: No valid results generated.")
 
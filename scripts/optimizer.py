@@ -5,21 +5,24 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
 if project_root not in sys.path:
     sys.path.append(project_root)
-import pandas as pd
 import numpy as np
 import itertools
 from strategy.stoikov_strategy import StoikovBot
 from strategy.risk_analyzer import RiskAnalyzer
+from data_stream import data_path
 
 
 
-def run_headless_backtest(df, gamma, sigma, alpha_w):
+def run_headless_backtest(df, gamma, sigma, alpha_w, features=None):
     """
     Executes a high-speed backtest without visualization.
     Updated to handle the triple return value (bid, ask, qty) from StoikovBot.
+    Pass precomputed features (strategy/feature_cache.py) to skip per-bar inference.
     """
     bot = StoikovBot(gamma=gamma, sigma=sigma, k=1.5, stop_loss=-1500.0) 
     bot.base_alpha_weight = alpha_w
+    if features is not None:
+        bot.use_precomputed_features(features)
     risk_engine = RiskAnalyzer()
     
     trade_count = 0 
@@ -56,7 +59,14 @@ def start_optimization(csv_path):
         print(f"❌ ERROR: File not found at {csv_path}")
         return
 
+    import pandas as pd
+    from strategy.feature_cache import load_signal_model, load_or_compute_features
     df = pd.read_csv(csv_path).head(2000)
+
+    # AI signal and volatility depend only on prices: compute them once for all runs
+    model = load_signal_model()
+    features = load_or_compute_features(df['close'].to_numpy(), model,
+                                        cache_dir=data_path("cache"))
     
     # --- Robust Parameter Space Configuration ---
     gammas = [0.1, 0.2, 0.3]
@@ -68,7 +78,7 @@ def start_optimization(csv_path):
     best_params = None
 
     for g, s, a in combinations:
-        stats = run_headless_backtest(df, g, s, a)
+        stats = run_headless_backtest(df, g, s, a, features)
         
         if stats['trade_count'] > 5:
             print(f"⚙️ G:{g} S:{s} A:{a} | Trades: {stats['trade_count']} | PnL: {stats['total_pnl']:.2f} | Sharpe: {stats['sharpe_ratio']:.6f}")
@@ -84,4 +94,4 @@ def start_optimization(csv_path):
         print("="*55 + "\n")
 
 if __name__ == "__main__":
-    start_optimization("data/binance_BTC_USDT_1m.csv")
\ No newline at end of file
+    start_optimization(data_path("binance_BTC_USDT_1m.csv"))
\ No newline at end of file
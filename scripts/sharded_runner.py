@@ -0,0 +1,220 @@
+import sys
+import os
+# Project root setup for relative imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+import argparse
+import multiprocessing as mp
+import time
+import numpy as np
+from shm_bus import MarketDataRing, RingReader, PortfolioTable
+
+
+def symbol_groups(n_symbols, n_workers):
+    """Round-robin symbol ids over workers so busy and quiet symbols spread evenly."""
+    return [list(range(w, n_symbols, n_workers)) for w in range(n_workers)]
+
+
+def market_data_feed(ring_name, n_symbols, duration_s, ticks_per_sec, seed=7, sigma=0.0002, spread_bps=1.0):
+    """
+    Market-data process: random-walks every symbol and publishes one tick per
+    symbol per sweep into the ring, pacing sweeps to hit ticks_per_sec overall.
+    """
+    ring = MarketDataRing.attach(ring_name)
+    rng = np.random.default_rng(seed)
+    mids = rng.uniform(20.0, 2000.0, n_symbols)
+    symbols = np.arange(n_symbols, dtype=np.int32)
+    sweep_ns = int(n_symbols / ticks_per_sec * 1e9)
+    start = time.perf_counter_ns()
+    end = start + int(duration_s * 1e9)
+    due = start
+    try:
+        while due < end:
+            now = time.perf_counter_ns()
+            if due > now:
+                time.sleep((due - now) / 1e9)
+            mids *= np.exp(rng.normal(0.0, sigma, n_symbols))
+            half = mids * spread_bps * 1e-4 / 2
+            ring.publish(ts_ns=np.full(n_symbols, due, dtype=np.int64), symbol=symbols, mid=mids,
+                         best_bid=mids - half, best_ask=mids + half,
+                         bid_qty=rng.uniform(0.5, 5.0, n_symbols), ask_qty=rng.uniform(0.5, 5.0, n_symbols))
+            due += sweep_ns
+    finally:
+        ring.close_stream()
+        ring.close()
+
+
+def strategy_worker(worker_id, ring_name, table_name, n_symbols, symbol_ids, bot_kwargs, tick_size=0.01):
+    """
+    One process per symbol group, each with its own StoikovBot / OrderBook /
+    QuoteManager per symbol. Every poll drains the ring in one vectorized copy;
+    fills are checked against the batch's extreme prices and each symbol is
+    quoted once per batch from its latest tick (intermediate ticks coalesce).
+    """
+    import torch
+    # Many single-threaded workers beat one process fighting over intra-op threads
+    torch.set_num_threads(1)
+    import aegis_lob as lob
+    from strategy.stoikov_strategy import StoikovBot
+    from strategy.order_manager import QuoteManager
+    from strategy.latency import LatencyRecorder, TimedOrderBook
+
+    ring = MarketDataRing.attach(ring_name)
+    table = PortfolioTable.attach(table_name, n_symbols)
+    reader = RingReader(ring)
+    mine = np.zeros(n_symbols, dtype=bool)
+    mine[symbol_ids] = True
+    bots = {sid: StoikovBot(**bot_kwargs).load_model() for sid in symbol_ids}
+    books = {sid: lob.OrderBook() for sid in symbol_ids}
+    for book in books.values():
+        book.set_logging(False)  # The engine would log every cancel to std::cout
+    # Each symbol's book calls are timed so the table can report the boundary cost
+    recorders = {sid: LatencyRecorder() for sid in symbol_ids}
+    managers = {sid: QuoteManager(TimedOrderBook(books[sid], recorders[sid]), tick_size=tick_size)
+                for sid in symbol_ids}
+    rows = table.rows
+    for sid in symbol_ids:
+        rows[sid]["worker"] = worker_id  # Doubles as the readiness signal for the parent
+
+    try:
+        while True:
+            batch = reader.poll()
+            if len(batch) == 0:
+                if reader.finished:
+                    break
+                time.sleep(0.0002)
+                continue
+            batch = batch[mine[batch["symbol"]]]
+            if len(batch) == 0:
+                continue
+
+            # 1. Group the batch by symbol (stable, so the last row per group is the newest tick)
+            order = np.argsort(batch["symbol"], kind="stable")
+            grouped = batch[order]
+            sym = grouped["symbol"]
+            starts = np.flatnonzero(np.r_[True, sym[1:] != sym[:-1]])
+            ends = np.r_[starts[1:], len(grouped)]
+            lows = np.minimum.reduceat(grouped["best_ask"], starts)
+            highs = np.maximum.reduceat(grouped["best_bid"], starts)
+            latest = grouped[ends - 1]
+
+            for g, sid in enumerate(sym[starts].tolist()):
+                bot, manager = bots[sid], managers[sid]
+                tick = latest[g]
+                mid = float(tick["mid"])
+
+                # 2. Fills against the quotes resting during this batch
+                for side, price, qty in manager.check_fills(float(lows[g]), float(highs[g])):
+                    bot.on_trade(side, price, qty)
+
+                # 3. Requote from the newest tick
+                if not bot.is_stopped:
+                    bid, ask, qty = bot.calculate_quotes(mid, float(tick["bid_qty"]), float(tick["ask_qty"]))
+                    if bot.is_stopped:
+                        manager.cancel_all()
+                    else:
+                        manager.update(bid, ask, qty)
+                    rows[sid]["quotes"] += 1
+
+                # 4. Publish this symbol's row
+                row = rows[sid]
+                row["ticks"] += int(ends[g] - starts[g])
+                row["fills"] = manager.fills
+                row["messages"] = manager.messages
+                row["stopped"] = int(bot.is_stopped)
+                row["book_calls"], row["book_ns"] = recorders[sid].totals("book.")
+                row["mid"] = mid
+                row["inventory"] = bot.inventory
+                row["cash"] = bot.cash
+                row["pnl"] = (bot.cash - bot.initial_balance) + bot.inventory * mid
+    finally:
+        rows = row = None  # Drop views into the shared buffer before unmapping it
+        table.close()
+        ring.close()
+
+
+def run_sharded(n_symbols=50, n_workers=None, duration_s=10.0, ticks_per_sec=20_000, capacity=1 << 16,
+                bot_kwargs=None, report_every_s=1.0):
+    """
+    Launches n_workers strategy processes plus one market-data process, all
+    joined through a shared-memory tick ring and portfolio table.
+    Returns the final per-symbol rows and the portfolio totals.
+    """
+    n_workers = n_workers or max(1, (os.cpu_count() or 2) - 1)
+    n_workers = min(n_workers, n_symbols)
+    bot_kwargs = bot_kwargs or dict(gamma=0.1, sigma=0.002, k=1.5, stop_loss=-500.0)
+    ctx = mp.get_context("spawn")
+    ring = MarketDataRing.create(n_symbols, capacity)
+    table = PortfolioTable.create(n_symbols)
+    print(f"🚀 Sharding {n_symbols} symbols over {n_workers} worker(s) (ring: {capacity} ticks)")
+
+    workers = []
+    try:
+        for wid, group in enumerate(symbol_groups(n_symbols, n_workers)):
+            p = ctx.Process(target=strategy_worker, name=f"aegis-worker-{wid}",
+                            args=(wid, ring.name, table.name, n_symbols, group, bot_kwargs))
+            p.start()
+            workers.append(p)
+
+        # 1. Wait until every worker has claimed its rows before market data starts
+        while (table.rows["worker"] < 0).any():
+            if not all(p.is_alive() for p in workers):
+                raise RuntimeError("a strategy worker exited during startup")
+            time.sleep(0.05)
+
+        # 2. Stream market data and report the portfolio while it runs
+        feed = ctx.Process(target=market_data_feed, name="aegis-market-data",
+                           args=(ring.name, n_symbols, duration_s, ticks_per_sec))
+        t0 = time.perf_counter()
+        feed.start()
+        while feed.is_alive():
+            feed.join(report_every_s)
+            tot = table.totals()
+            lag = ring.head - tot["ticks"]
+            print(f"   t={time.perf_counter() - t0:6.1f}s | ticks: {tot['ticks']:>10} | fills: {tot['fills']:>6} "
+                  f"| PnL: {tot['pnl']:>10.2f} | gross: {tot['gross_notional']:>10.2f} | lag: {lag}")
+
+        # 3. Workers drain the ring and exit once the stream is closed
+        for p in workers:
+            p.join()
+        elapsed = time.perf_counter() - t0
+        rows, totals = table.snapshot(), table.totals()
+    finally:
+        for p in workers:
+            if p.is_alive():
+                p.terminate()
+                p.join()
+        table.close()
+        ring.close()
+
+    totals["ticks_per_sec"] = totals["ticks"] / elapsed if elapsed > 0 else 0.0
+    return rows, totals
+
+
+def print_report(rows, totals, top=10):
+    print("\n" + "="*72)
+    print("      AEGIS-LOB: SHARDED PORTFOLIO REPORT")
+    print("="*72)
+    print(f"{'symbol':<10}{'worker':>8}{'ticks':>10}{'fills':>8}{'inventory':>14}{'PnL':>14}")
+    for sid in np.argsort(-np.abs(rows["pnl"]))[:top]:
+        r = rows[sid]
+        print(f"{'SYM%03d' % sid:<10}{r['worker']:>8}{r['ticks']:>10}{r['fills']:>8}"
+              f"{r['inventory']:>14.4f}{r['pnl']:>14.2f}")
+    print("-"*72)
+    for name, value in totals.items():
+        print(f"{name:<20}: {value:>16,.2f}" if isinstance(value, float) else f"{name:<20}: {value:>16,}")
+    print("="*72)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aegis-LOB multi-symbol sharded runner")
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--rate", type=float, default=20_000, help="total ticks per second")
+    parser.add_argument("--capacity", type=int, default=1 << 16, help="ring size in ticks")
+    args = parser.parse_args()
+    rows, totals = run_sharded(args.symbols, args.workers, args.duration, args.rate, args.capacity)
+    print_report(rows, totals)
@@ -5,38 +5,42 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
 if project_root not in sys.path:
     sys.path.append(project_root)
-import pandas as pd
 import numpy as np
 from strategy.stoikov_strategy import StoikovBot
 from strategy.risk_analyzer import RiskAnalyzer
+from data_stream import data_path, iter_market_bars, iter_market_chunks
 
 
 
-def run_stress_test(scenario_name, file_path):
+def run_stress_test(scenario_name, file_path, model=None):
     """
     Executes the bot against a specific historical market regime.
     Updated to handle the triple return value (bid, ask, current_qty).
     """
     print(f"--- TEST SCENARIO: {scenario_name} ---")
-    df = pd.read_csv(file_path)
     
     # Locking in champion settings for validation
     bot = StoikovBot(gamma=0.1, sigma=0.002, k=1.5, stop_loss=-500.0)
-    risk_engine = RiskAnalyzer()
+    risk_engine = RiskAnalyzer(streaming=True)
 
-    for i, row in df.iterrows():
-        mid = row['close']
-        v_bid = row['bid_qty'] if 'bid_qty' in row else 1.0
-        v_ask = row['ask_qty'] if 'ask_qty' in row else 1.0
+    # Batch-precompute the price-only features (cached across runs) instead of
+    # running one LSTM forward per bar
+    if model is not None:
+        from strategy.feature_cache import load_or_compute_features
+        prices = np.concatenate([c['close'] for _, c in iter_market_chunks(file_path, columns=('close',))])
+        bot.use_precomputed_features(load_or_compute_features(
+            prices, model, cache_dir=data_path("cache")))
 
+    # Bars are streamed chunk by chunk so large regime files never load fully
+    for i, mid, high, low, v_bid, v_ask in iter_market_bars(file_path):
         # CRITICAL FIX: Unpacking 3 values (bid, ask, Kelly-calculated quantity)
         my_bid, my_ask, current_qty = bot.calculate_quotes(mid, v_bid, v_ask)
 
         if not bot.is_stopped:
             # Match simulation: Using dynamic 'current_qty' instead of hardcoded 0.01
-            if row['low'] <= my_bid and my_bid > 0:
+            if low <= my_bid and my_bid > 0:
                 bot.on_trade(1, my_bid, current_qty)
-            elif row['high'] >= my_ask and my_ask > 0:
+            elif high >= my_ask and my_ask > 0:
                 bot.on_trade(0, my_ask, current_qty)
 
         # Equity tracking: Cash + Market Value of Inventory
@@ -54,15 +58,18 @@ def start_mega_test():
     Iterates through different market regimes to validate strategy robustness.
     """
     scenarios = {
-        "Sideways Market": "data/binance_BTC_USDT_sideways.csv",
-        "Extreme Downtrend (Crash)": "data/binance_BTC_USDT_crash.csv",
-        "Extreme Uptrend (Moon)": "data/binance_BTC_USDT_moon.csv"
+        "Sideways Market": data_path("binance_BTC_USDT_sideways.csv"),
+        "Extreme Downtrend (Crash)": data_path("binance_BTC_USDT_crash.csv"),
+        "Extreme Uptrend (Moon)": data_path("binance_BTC_USDT_moon.csv")
     }
     
+    import pandas as pd
+    from strategy.feature_cache import load_signal_model
+    model = load_signal_model()
     summary = []
     for name, path in scenarios.items():
         if os.path.exists(path):
-            res = run_stress_test(name, path)
+            res = run_stress_test(name, path, model)
             summary.append({
                 "Scenario": name, 
                 "PnL": res['total_pnl'], 
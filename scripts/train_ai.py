@@ -1,10 +1,10 @@
 import sys
 import os
-import pandas as pd
 import numpy as np
 import torch
 import torch.nn as nn
-from sklearn.preprocessing import MinMaxScaler
+from numpy.lib.stride_tricks import sliding_window_view
+from torch.utils.data import Dataset, DataLoader, BatchSampler, RandomSampler
 
 # --- CRITICAL: PROJECT ROOT CONFIGURATION ---
 # This ensures the script can locate the 'strategy' and 'data' directories
@@ -14,14 +14,84 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from strategy.ai_model import PricePredictorLSTM 
+from data_stream import data_path, iter_market_chunks
 
-def train_with_real_data(file_path, epochs=50, seq_length=50):
+
+def load_price_memmap(csv_path, cache_dir, min_rows=1):
+    """
+    Extracts the 'close' column into a flat float32 file once (streamed in chunks)
+    and returns it as a read-only memmap. The cache name encodes the CSV's size and
+    mtime, so an updated dataset is re-extracted automatically.
+    Raises ValueError if the dataset has fewer than min_rows prices.
+    """
+    stat = os.stat(csv_path)
+    if stat.st_size == 0:
+        raise ValueError(f"{csv_path} is empty; need at least {min_rows} 'close' rows")
+    name = f"{os.path.splitext(os.path.basename(csv_path))[0]}_{stat.st_size}_{int(stat.st_mtime)}_close.f32"
+    path = os.path.join(cache_dir, name)
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            for _, chunk in iter_market_chunks(csv_path, columns=('close',)):
+                chunk['close'].astype(np.float32).tofile(f)
+        os.replace(path + ".tmp", path)
+    n_rows = os.path.getsize(path) // np.dtype(np.float32).itemsize
+    if n_rows < min_rows:
+        raise ValueError(f"{csv_path} has {n_rows} 'close' rows; need at least {min_rows}")
+    return path, np.memmap(path, dtype=np.float32, mode='r')
+
+
+class PriceWindowDataset(Dataset):
+    """
+    Windows of seq_length inputs plus one target, exposed as a zero-copy
+    sliding_window_view over the memory-mapped price column. Indexed with a
+    whole list of window ids (via BatchSampler), so only the mini-batch itself
+    is ever materialised, and scaled on the fly with the global min/max.
+    """
+    def __init__(self, path, seq_length, p_min, p_max):
+        self.path = path
+        self.seq_length = seq_length
+        self.p_min = p_min
+        self.scale = (p_max - p_min) or 1.0
+        self._windows = None
+
+    @property
+    def windows(self):
+        # Opened lazily so worker processes map the file instead of receiving a pickled copy
+        if self._windows is None:
+            prices = np.memmap(self.path, dtype=np.float32, mode='r')
+            self._windows = sliding_window_view(prices, self.seq_length + 1)
+        return self._windows
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_windows'] = None
+        return state
+
+    def __len__(self):
+        return len(self.windows)
+
+    def __getitem__(self, idx):
+        batch = (self.windows[np.sort(idx)] - self.p_min) / self.scale
+        X = torch.from_numpy(batch[:, :-1, None].astype(np.float32))
+        y = torch.from_numpy(batch[:, -1:].astype(np.float32))
+        return X, y
+
+
+def _init_worker(_):
+    # Loader workers only slice and scale; leave the cores to the main process
+    torch.set_num_threads(1)
+
+
+def train_with_real_data(file_path, epochs=50, seq_length=50, batch_size=512, num_workers=None):
     """
     Trains the LSTM model using real Binance OHLCV data.
     Implements fine-tuning if V1 weights are detected.
+    Streams shuffled mini-batches from a memory-mapped price column, so memory
+    stays bounded by batch_size regardless of the dataset length.
     """
-    # 1. Path Resolution
-    actual_file_path = os.path.join(project_root, file_path)
+    # 1. Path Resolution (dataset relative to the cwd; models and cache under the data dir)
+    actual_file_path = file_path
     if not os.path.exists(actual_file_path):
         print(f"❌ ERROR: Dataset not found at {actual_file_path}")
         return
@@ -29,35 +99,41 @@ def train_with_real_data(file_path, epochs=50, seq_length=50):
     print(f"--- AEGIS-LOB AI TRAINING INITIATED: {os.path.basename(actual_file_path)} ---")
     
     # 2. Data Preprocessing
-    df = pd.read_csv(actual_file_path)
-    if 'close' not in df.columns:
+    try:
+        # One training window is seq_length inputs plus the target
+        price_path, prices = load_price_memmap(actual_file_path, data_path("cache"),
+                                               min_rows=seq_length + 1)
+    except KeyError:
         print("❌ ERROR: 'close' column missing from the dataset.")
         return
+    except ValueError as e:
+        print(f"❌ ERROR: Not enough data to build training windows: {e}")
+        return
 
-    prices = df['close'].values.reshape(-1, 1)
-
-    # Normalize data for LSTM stability
-    scaler = MinMaxScaler(feature_range=(0, 1))
-    scaled_prices = scaler.fit_transform(prices)
-
-    def create_sequences(data, length):
-        xs, ys = [], []
-        for i in range(len(data) - length):
-            xs.append(data[i:(i + length)])
-            ys.append(data[i + length])
-        return np.array(xs), np.array(ys)
-
-    X, y = create_sequences(scaled_prices, seq_length)
-    X = torch.from_numpy(X).float()
-    y = torch.from_numpy(y).float()
+    # Normalize data for LSTM stability (global min-max, as MinMaxScaler did)
+    dataset = PriceWindowDataset(price_path, seq_length, float(prices.min()), float(prices.max()))
 
     # 3. Model & Hardware Configuration (GPU/CPU)
+    # Keep one core for the optimizer step; the rest slice batches in loader workers
+    if num_workers is None:
+        num_workers = max(0, min(4, (os.cpu_count() or 1) - 1))
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) - num_workers))
     model = PricePredictorLSTM().to(device)
-    X, y = X.to(device), y.to(device)
+
+    # batch_size=None: the BatchSampler hands each __getitem__ call a full list of indices
+    loader = DataLoader(
+        dataset,
+        sampler=BatchSampler(RandomSampler(dataset), batch_size=batch_size, drop_last=False),
+        batch_size=None,
+        num_workers=num_workers,
+        worker_init_fn=_init_worker,
+        persistent_workers=num_workers > 0,
+        pin_memory=device.type == "cuda",
+    )
     
     # Fine-tuning: Load V1 weights if they exist in the models directory
-    model_dir = os.path.join(project_root, "data", "models")
+    model_dir = data_path("models")
     v1_path = os.path.join(model_dir, "price_lstm.pth")
     if os.path.exists(v1_path):
         model.load_state_dict(torch.load(v1_path, map_location=device))
@@ -67,17 +143,23 @@ def train_with_real_data(file_path, epochs=50, seq_length=50):
     optimizer = torch.optim.Adam(model.parameters(), lr=0.0005)
 
     # 4. Training Loop
-    print(f"Training on {device.type.upper()}...")
+    print(f"Training on {device.type.upper()} | {len(dataset)} windows | "
+          f"{len(loader)} mini-batches/epoch | {num_workers} loader workers")
     for epoch in range(epochs):
         model.train()
-        optimizer.zero_grad()
-        output = model(X)
-        loss = criterion(output, y)
-        loss.backward()
-        optimizer.step()
+        epoch_loss = 0.0
+        for X, y in loader:
+            X = X.to(device, non_blocking=True)
+            y = y.to(device, non_blocking=True)
+            optimizer.zero_grad()
+            output = model(X)
+            loss = criterion(output, y)
+            loss.backward()
+            optimizer.step()
+            epoch_loss += loss.item() * len(X)
         
         if (epoch + 1) % 10 == 0:
-            print(f"Epoch [{epoch+1}/{epochs}] | Loss: {loss.item():.8f}")
+            print(f"Epoch [{epoch+1}/{epochs}] | Loss: {epoch_loss / len(dataset):.8f}")
 
     # 5. Persist Model Weights
     if not os.path.exists(model_dir): 
@@ -88,5 +170,4 @@ def train_with_real_data(file_path, epochs=50, seq_length=50):
     print(f"--- ✅ SUCCESS: Model saved at {save_path} ---")
 
 if __name__ == "__main__":
-    # Default path assumes execution from scripts/ folder
-    train_with_real_data("data/binance_BTC_USDT_1m.csv")
\ No newline at end of file
+    train_with_real_data(data_path("binance_BTC_USDT_1m.csv"))
\ No newline at end of file
@@ -1,33 +1,209 @@
-import matplotlib.pyplot as plt
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 
-def plot_session(results):
-    steps = [r['step'] for r in results]
-    mids = [r['mid'] for r in results]
-    invs = [r['inv'] for r in results]
-    pnls = [r['pnl'] for r in results]
+# Default figure geometry; series are reduced to roughly one point per pixel column
+FIGSIZE = (10, 12)
+DPI = 100
 
-    fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(10, 12), sharex=True)
+
+def lttb_downsample(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling. Keeps the first and last points
+    and, per bucket, the point forming the largest triangle with its neighbours,
+    which preserves peaks and troughs far better than stride sampling.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out_idx = np.empty(n_out, dtype=np.int64)
+    out_idx[0], out_idx[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Average of the next bucket (or the last point for the final bucket)
+        nxt_lo, nxt_hi = edges[b + 1], edges[b + 2] if b + 2 < len(edges) else n
+        avg_x = x[nxt_lo:nxt_hi].mean()
+        avg_y = y[nxt_lo:nxt_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        out_idx[b + 1] = a
+    return x[out_idx], y[out_idx]
+
+
+def minmax_downsample(x, y, n_buckets):
+    """
+    Min/max-per-bucket reduction. Emits the extreme points of every bucket in
+    index order, so the drawn envelope matches the full-resolution line.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if 2 * n_buckets >= n:
+        return x, y
+
+    starts = (np.arange(n_buckets) * n) // n_buckets
+    i_min = _reduceat_arg(y, starts, np.minimum)
+    i_max = _reduceat_arg(y, starts, np.maximum)
+    idx = np.sort(np.stack([i_min, i_max], axis=1), axis=1).ravel()
+    return x[idx], y[idx]
+
+
+def _reduceat_arg(y, starts, reducer):
+    """Index of the first extreme element (np.minimum / np.maximum) of each bucket."""
+    ext = reducer.reduceat(y, starts)
+    bucket = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(y))))
+    hit = np.flatnonzero(y == ext[bucket])
+    # First hit per bucket
+    first = np.unique(bucket[hit], return_index=True)[1]
+    return hit[first]
+
+
+class _StreamingMinMax:
+    """
+    Accumulates per-bucket min/max over a series of known total length that
+    arrives in chunks, so files larger than RAM reduce to a fixed-size envelope.
+    """
+    def __init__(self, total, n_buckets, fields):
+        self.total = total
+        self.n_buckets = min(n_buckets, total)
+        self.x = np.full(self.n_buckets, np.nan)
+        self.mins = {f: np.full(self.n_buckets, np.inf) for f in fields}
+        self.maxs = {f: np.full(self.n_buckets, -np.inf) for f in fields}
+
+    def add(self, offset, x, columns):
+        bucket = ((offset + np.arange(len(x))) * self.n_buckets) // self.total
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket)) + 1))
+        ub = bucket[starts]
+        self.x[ub] = np.where(np.isnan(self.x[ub]), x[starts], self.x[ub])
+        for f, col in columns.items():
+            col = np.asarray(col, dtype=np.float64)
+            self.mins[f][ub] = np.minimum(self.mins[f][ub], np.minimum.reduceat(col, starts))
+            self.maxs[f][ub] = np.maximum(self.maxs[f][ub], np.maximum.reduceat(col, starts))
+
+    def series(self, field):
+        """Interleaved (min, max) points per bucket, drawn at the bucket's first x."""
+        xs = np.repeat(self.x, 2)
+        ys = np.stack([self.mins[field], self.maxs[field]], axis=1).ravel()
+        return xs, ys
+
+
+def _draw_session(fig, steps, mids, inv_x, invs, pnl_x, pnls):
+    ax1, ax2, ax3 = fig.subplots(3, 1, sharex=True)
 
     # 1. Price Chart
-    ax1.plot(steps, mids, label='Mid Price', color='blue', marker='o')
+    ax1.plot(steps, mids, label='Mid Price', color='blue', linewidth=1)
     ax1.set_ylabel('Price')
     ax1.legend()
     ax1.grid(True)
 
-    # 2. Inventory Chart
-    ax2.bar(steps, invs, color='orange', alpha=0.6, label='Inventory')
+    # 2. Inventory Chart (step/fill instead of one bar per step)
+    ax2.fill_between(inv_x, invs, 0, step='post', color='orange', alpha=0.6, label='Inventory')
+    ax2.step(inv_x, invs, where='post', color='darkorange', linewidth=0.8)
     ax2.axhline(0, color='black', linestyle='--')
     ax2.set_ylabel('Position Size')
     ax2.legend()
     ax2.grid(True)
 
     # 3. Cumulative P&L Chart
-    ax3.plot(steps, pnls, label='Total P&L', color='green', linewidth=2)
+    ax3.plot(pnl_x, pnls, label='Total P&L', color='green', linewidth=2)
     ax3.set_ylabel('Profit / Loss')
     ax3.set_xlabel('Step')
     ax3.legend()
     ax3.grid(True)
 
-    plt.suptitle('Aegis-LOB: Stoikov Strategy Performance', fontsize=16)
-    plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    fig.suptitle('Aegis-LOB: Stoikov Strategy Performance', fontsize=16)
+    fig.tight_layout()
+
+
+def _new_figure(out_file):
+    """
+    Headless renders use a bare Agg-backed Figure, which avoids pyplot's global
+    state and is safe in worker processes. Interactive sessions go through pyplot.
+    """
+    if out_file:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        fig = Figure(figsize=FIGSIZE)
+        FigureCanvasAgg(fig)
+        return fig
+
+    import matplotlib.pyplot as plt
+    return plt.figure(figsize=FIGSIZE)
+
+
+def _finish(fig, out_file):
+    if out_file:
+        fig.savefig(out_file, dpi=DPI)
+        return out_file
+
+    import matplotlib.pyplot as plt
+    plt.show()
+
+
+def plot_session(results, out_file=None, width_px=FIGSIZE[0] * DPI):
+    """
+    Plots a session from a list of per-step dicts or a structured telemetry
+    array (see data_logger.read_telemetry). Series are downsampled to roughly
+    the figure's pixel width before drawing. Pass out_file to render
+    headlessly to an image instead of opening a window.
+    """
+    if isinstance(results, np.ndarray):
+        steps, mids, invs, pnls = (results[f] for f in ('step', 'mid', 'inv', 'pnl'))
+    else:
+        steps = [r['step'] for r in results]
+        mids = [r['mid'] for r in results]
+        invs = [r['inv'] for r in results]
+        pnls = [r['pnl'] for r in results]
+
+    price_x, price_y = lttb_downsample(steps, mids, 2 * width_px)
+    inv_x, inv_y = minmax_downsample(steps, invs, width_px)
+    pnl_x, pnl_y = lttb_downsample(steps, pnls, 2 * width_px)
+
+    fig = _new_figure(out_file)
+    _draw_session(fig, price_x, price_y, inv_x, inv_y, pnl_x, pnl_y)
+    return _finish(fig, out_file)
+
+
+def plot_telemetry(path, out_file=None, chunk_size=1_000_000, width_px=FIGSIZE[0] * DPI):
+    """
+    Plots a binary telemetry file written by StreamingDataLogger. The file is
+    read in chunks and reduced to a per-pixel min/max envelope, so memory use
+    is bounded by chunk_size regardless of the run length.
+    """
+    from data_logger import read_telemetry, iter_telemetry_chunks
+
+    total = len(read_telemetry(path))
+    if total == 0:
+        print(f"⚠️ [WARNING] No records in {path}.")
+        return None
+
+    acc = _StreamingMinMax(total, width_px, ('mid', 'inv', 'pnl'))
+    offset = 0
+    for chunk in iter_telemetry_chunks(path, chunk_size):
+        acc.add(offset, chunk['step'].astype(np.float64),
+                {f: chunk[f] for f in ('mid', 'inv', 'pnl')})
+        offset += len(chunk)
+
+    fig = _new_figure(out_file)
+    _draw_session(fig, *acc.series('mid'), *acc.series('inv'), *acc.series('pnl'))
+    return _finish(fig, out_file)
+
+
+def render_reports(paths, out_dir=None, workers=None):
+    """
+    Renders telemetry files to PNG reports in parallel worker processes.
+    Each worker draws with the Agg backend, so no display is required.
+    Reports go to <data dir>/reports unless out_dir is given.
+    """
+    if out_dir is None:
+        from data_stream import data_path
+        out_dir = data_path("reports")
+    os.makedirs(out_dir, exist_ok=True)
+    targets = [os.path.join(out_dir, os.path.splitext(os.path.basename(p))[0] + ".png") for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(plot_telemetry, paths, targets))
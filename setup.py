@@ -20,5 +20,13 @@ setup(
     description="A high-performance C++ Order Book for the Aegis-LOB Quant Framework",
     ext_modules=ext_modules,
     cmdclass={"build_ext": build_ext},
+    # --- Python layer and the `aegis` console command (see aegis_cli.py) ---
+    # Everything installs under a single site-packages/aegis directory instead of
+    # generic top-level names (scripts, strategy, data_logger, ...). aegis_cli puts
+    # that directory first on sys.path, so the in-tree imports work unchanged.
+    packages=["aegis", "aegis.strategy", "aegis.scripts"],
+    package_dir={"aegis": "."},
+    entry_points={"console_scripts": ["aegis=aegis.aegis_cli:main"]},
+    python_requires=">=3.8",
     zip_safe=False,
 )
\ No newline at end of file
@@ -0,0 +1,208 @@
+import numpy as np
+from multiprocessing import shared_memory
+
+# One top-of-book update, padded to a 64-byte cache line.
+TICK_DTYPE = np.dtype([
+    ("seq", "<i8"),
+    ("ts_ns", "<i8"),
+    ("symbol", "<i4"),
+    ("_pad", "<i4"),
+    ("mid", "<f8"),
+    ("best_bid", "<f8"),
+    ("best_ask", "<f8"),
+    ("bid_qty", "<f8"),
+    ("ask_qty", "<f8"),
+])
+TICK_FIELDS = ("ts_ns", "symbol", "mid", "best_bid", "best_ask", "bid_qty", "ask_qty")
+
+# Ring header (int64 slots): write cursor, closed flag, capacity, symbol count.
+_HEAD, _CLOSED, _CAPACITY, _N_SYMBOLS = range(4)
+_HEADER_BYTES = 64
+
+# One row per symbol, written only by the worker that owns the symbol.
+SUMMARY_DTYPE = np.dtype([
+    ("worker", "<i8"),
+    ("ticks", "<i8"),
+    ("quotes", "<i8"),
+    ("fills", "<i8"),
+    ("messages", "<i8"),
+    ("stopped", "<i8"),
+    ("book_calls", "<i8"),   # Python -> OrderBook calls (strategy.latency.TimedOrderBook)
+    ("book_ns", "<i8"),
+    ("mid", "<f8"),
+    ("inventory", "<f8"),
+    ("cash", "<f8"),
+    ("pnl", "<f8"),
+])
+
+
+class MarketDataRing:
+    """
+    Single-producer / multi-consumer tick ring in POSIX shared memory.
+    The producer writes whole batches of records and then advances the head
+    cursor; consumers poll that cursor and copy new records out with one
+    vectorized read. Nothing is pickled and no syscall is made per tick.
+    Each slot's seq doubles as a seqlock version: it is set to -1 before the
+    slot is rewritten and to the record's seq once the write is complete.
+    """
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((8,), dtype=np.int64, buffer=shm.buf)
+        self.capacity = int(self.header[_CAPACITY])
+        self.n_symbols = int(self.header[_N_SYMBOLS])
+        self.records = np.ndarray((self.capacity,), dtype=TICK_DTYPE, buffer=shm.buf, offset=_HEADER_BYTES)
+
+    @classmethod
+    def create(cls, n_symbols, capacity=1 << 16, name=None):
+        size = _HEADER_BYTES + capacity * TICK_DTYPE.itemsize
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((8,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[_CAPACITY] = capacity
+        header[_N_SYMBOLS] = n_symbols
+        del header
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def head(self):
+        return int(self.header[_HEAD])
+
+    @property
+    def closed(self):
+        return bool(self.header[_CLOSED])
+
+    def publish(self, **columns):
+        """
+        Appends a batch of ticks given as equal-length arrays keyed by TICK_FIELDS
+        (missing fields are zero). The head moves only after the records are written.
+        """
+        n = len(columns["symbol"])
+        for s in range(0, n, self.capacity):
+            e = min(n, s + self.capacity)
+            seq0 = self.head
+            seqs = np.arange(seq0, seq0 + (e - s), dtype=np.int64)
+            batch = np.zeros(e - s, dtype=TICK_DTYPE)
+            batch["seq"] = -1
+            for field, values in columns.items():
+                batch[field] = values[s:e]
+            slots = seqs % self.capacity
+            # Seqlock order: invalidate the slots, write the payload, then the seqs
+            self.records["seq"][slots] = -1
+            self.records[slots] = batch
+            self.records["seq"][slots] = seqs
+            self.header[_HEAD] = seq0 + (e - s)
+        return n
+
+    def close_stream(self):
+        """Marks end-of-stream; readers drain what is left and then stop."""
+        self.header[_CLOSED] = 1
+
+    def close(self):
+        # Views must go before the mapping can be released
+        del self.header, self.records
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class RingReader:
+    """
+    Per-consumer cursor over a MarketDataRing. A consumer that falls more than
+    `capacity` records behind skips ahead to the oldest intact record and counts
+    the gap in `overruns`.
+    """
+    def __init__(self, ring, from_start=True):
+        self.ring = ring
+        self.next_seq = 0 if from_start else ring.head
+        self.overruns = 0
+
+    def poll(self, max_batch=4096):
+        """Returns a copy of up to max_batch new records (possibly empty)."""
+        ring = self.ring
+        head = ring.head
+        oldest = head - ring.capacity
+        if self.next_seq < oldest:
+            self.overruns += oldest - self.next_seq
+            self.next_seq = oldest
+        n = min(head - self.next_seq, max_batch)
+        if n <= 0:
+            return ring.records[:0].copy()
+        seqs = np.arange(self.next_seq, self.next_seq + n, dtype=np.int64)
+        slots = seqs % ring.capacity
+        out = ring.records[slots]
+        # The producer may have lapped us while we copied. A slot is intact only if
+        # its seq is unchanged after the copy: a rewrite sets it to -1 first, so a
+        # record that is half new and half old never passes.
+        valid = (out["seq"] == seqs) & (ring.records["seq"][slots] == seqs)
+        if not valid.all():
+            self.overruns += int((~valid).sum())
+            out = out[valid]
+        self.next_seq += n
+        return out
+
+    @property
+    def finished(self):
+        return self.ring.closed and self.next_seq >= self.ring.head
+
+
+class PortfolioTable:
+    """
+    Shared per-symbol summary rows (SUMMARY_DTYPE). Each row has exactly one
+    writer, so no locking is needed; readers may see a row mid-update, which
+    is fine for monitoring and for the end-of-run aggregate.
+    """
+    def __init__(self, shm, n_symbols, owner):
+        self.shm = shm
+        self.owner = owner
+        self.rows = np.ndarray((n_symbols,), dtype=SUMMARY_DTYPE, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, n_symbols, name=None):
+        shm = shared_memory.SharedMemory(name=name, create=True, size=n_symbols * SUMMARY_DTYPE.itemsize)
+        table = cls(shm, n_symbols, owner=True)
+        table.rows[:] = np.zeros(n_symbols, dtype=SUMMARY_DTYPE)
+        table.rows["worker"] = -1
+        return table
+
+    @classmethod
+    def attach(cls, name, n_symbols):
+        return cls(shared_memory.SharedMemory(name=name), n_symbols, owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def snapshot(self):
+        return self.rows.copy()
+
+    def totals(self):
+        """Portfolio aggregate across all symbols."""
+        rows = self.snapshot()
+        notional = rows["inventory"] * rows["mid"]
+        return {
+            "pnl": float(rows["pnl"].sum()),
+            "net_notional": float(notional.sum()),
+            "gross_notional": float(np.abs(notional).sum()),
+            "ticks": int(rows["ticks"].sum()),
+            "quotes": int(rows["quotes"].sum()),
+            "fills": int(rows["fills"].sum()),
+            "messages": int(rows["messages"].sum()),
+            "stopped": int(rows["stopped"].sum()),
+            "book_calls": int(rows["book_calls"].sum()),
+            "book_call_us": float(rows["book_ns"].sum() / max(rows["book_calls"].sum(), 1) / 1e3),
+        }
+
+    def close(self):
+        del self.rows
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
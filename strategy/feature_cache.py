@@ -0,0 +1,118 @@
+import io
+import os
+import hashlib
+import numpy as np
+import torch
+from numpy.lib.stride_tricks import sliding_window_view
+from strategy.ai_model import PricePredictorLSTM
+from data_stream import data_path
+
+# Must match StoikovBot: 50-bar LSTM window, 30-bar rolling volatility
+SIGNAL_WINDOW = 50
+VOL_WINDOW = 30
+
+# Without trained weights the LSTM is initialised from this seed, so every process
+# (live bot, optimizer, stress runs) uses the same network and cache key
+UNTRAINED_SEED = 1234
+UNTRAINED_ID = hashlib.sha256(f"untrained-seed{UNTRAINED_SEED}".encode()).hexdigest()
+
+
+def default_weights_path():
+    """Trained LSTM weights shared by StoikovBot and the precomputation scripts."""
+    return data_path("models", "price_lstm.pth")
+
+
+def model_hash(model):
+    """
+    Cache identity of a model: the weights_id set by load_signal_model (SHA-256 of
+    the weights file, or UNTRAINED_ID), else SHA-256 over the state_dict.
+    """
+    weights_id = getattr(model, "weights_id", None)
+    if weights_id is not None:
+        return weights_id
+    h = hashlib.sha256()
+    for name, tensor in model.state_dict().items():
+        h.update(name.encode())
+        h.update(tensor.detach().cpu().contiguous().numpy().tobytes())
+    return h.hexdigest()
+
+
+def dataset_hash(prices):
+    """SHA-256 of the float64 price series."""
+    return hashlib.sha256(np.ascontiguousarray(prices, dtype=np.float64).tobytes()).hexdigest()
+
+
+def load_signal_model(weights_path=None, device=None):
+    """
+    Builds the LSTM used by StoikovBot and for precomputation. Loads trained weights
+    from weights_path (default: default_weights_path()) when the file exists, else
+    initialises from UNTRAINED_SEED without touching the global torch RNG.
+    """
+    weights_path = weights_path or default_weights_path()
+    device = device or torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    if os.path.exists(weights_path):
+        with open(weights_path, "rb") as f:
+            blob = f.read()
+        model = PricePredictorLSTM()
+        model.load_state_dict(torch.load(io.BytesIO(blob), map_location="cpu"))
+        model.weights_id = hashlib.sha256(blob).hexdigest()
+    else:
+        with torch.random.fork_rng(devices=[]):
+            torch.manual_seed(UNTRAINED_SEED)
+            model = PricePredictorLSTM()
+        model.weights_id = UNTRAINED_ID
+    model.to(device).eval()
+    return model
+
+
+def compute_features(prices, model, batch_size=4096):
+    """
+    Runs the model over every 50-bar window in large batches and computes the
+    30-bar rolling volatility, reproducing what StoikovBot derives per bar.
+    Returns {'ai_signal': pred_price - mid (before alpha weighting, 0 during warm-up),
+             'market_vol': std/mid (NaN during warm-up, where the bot falls back to sigma)}.
+    """
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    n = len(prices)
+    ai_signal = np.zeros(n)
+    market_vol = np.full(n, np.nan)
+    device = next(model.parameters()).device
+
+    if n >= SIGNAL_WINDOW:
+        windows = sliding_window_view(prices, SIGNAL_WINDOW)
+        model.eval()
+        with torch.no_grad():
+            for s in range(0, len(windows), batch_size):
+                w = windows[s:s + batch_size]
+                p_min = w.min(axis=1, keepdims=True)
+                p_rng = w.max(axis=1, keepdims=True) - p_min + 1e-8
+                tensor = torch.from_numpy((w - p_min) / p_rng).float().unsqueeze(-1).to(device)
+                pred = model(tensor).cpu().numpy().astype(np.float64)
+                end = SIGNAL_WINDOW - 1 + s
+                ai_signal[end:end + len(w)] = (pred * p_rng + p_min - w[:, -1:]).ravel()
+
+    # The bot uses the rolling std only once it holds more than VOL_WINDOW prices
+    if n > VOL_WINDOW:
+        vol_windows = sliding_window_view(prices, VOL_WINDOW)[1:]
+        market_vol[VOL_WINDOW:] = vol_windows.std(axis=1) / prices[VOL_WINDOW:]
+
+    return {"ai_signal": ai_signal, "market_vol": market_vol}
+
+
+def load_or_compute_features(prices, model, cache_dir=None, batch_size=4096):
+    """
+    Returns precomputed features for (model, prices), reading them from an .npz
+    cache keyed by model_hash(model) and the dataset hash when available.
+    """
+    cache_dir = cache_dir or data_path("cache")
+    key = f"features_{model_hash(model)[:16]}_{dataset_hash(prices)[:16]}.npz"
+    path = os.path.join(cache_dir, key)
+    if os.path.exists(path):
+        with np.load(path) as cached:
+            return {name: cached[name] for name in cached.files}
+
+    features = compute_features(prices, model, batch_size)
+    os.makedirs(cache_dir, exist_ok=True)
+    np.savez(path + ".tmp.npz", **features)
+    os.replace(path + ".tmp.npz", path)
+    return features
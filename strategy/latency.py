@@ -0,0 +1,138 @@
+import time
+import numpy as np
+
+# Log-linear (HDR-style) bucket layout: values below 2**SUB_BITS ns get one bucket
+# each; every further power of two is split into 2**SUB_BITS linear sub-buckets,
+# giving ~1.5% relative precision from 1 ns up to ~2**MAX_EXP ns (~18 minutes).
+SUB_BITS = 6
+SUB_COUNT = 1 << SUB_BITS
+MAX_EXP = 40
+N_BUCKETS = (MAX_EXP - SUB_BITS + 2) * SUB_COUNT
+
+
+def _bucket_index(value_ns):
+    """Maps a nanosecond value to its fixed bucket in O(1) using bit_length."""
+    if value_ns < SUB_COUNT:
+        return max(0, value_ns)
+    exp = value_ns.bit_length() - SUB_BITS
+    if exp > MAX_EXP - SUB_BITS + 1:
+        return N_BUCKETS - 1
+    return exp * SUB_COUNT + ((value_ns >> (exp - 1)) - SUB_COUNT)
+
+
+def _bucket_upper(index):
+    """Upper bound (ns) of the values that land in bucket `index`."""
+    exp, sub = divmod(index, SUB_COUNT)
+    if exp == 0:
+        return sub
+    return ((SUB_COUNT + sub + 1) << (exp - 1)) - 1
+
+
+class LatencyHistogram:
+    """Fixed-size latency histogram with constant-time recording."""
+    def __init__(self):
+        self.counts = np.zeros(N_BUCKETS, dtype=np.int64)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, value_ns):
+        self.counts[_bucket_index(value_ns)] += 1
+        self.count += 1
+        self.total_ns += value_ns
+        if value_ns > self.max_ns: self.max_ns = value_ns
+
+    def percentile(self, q):
+        if self.count == 0:
+            return 0
+        rank = int(np.ceil(q / 100.0 * self.count))
+        idx = int(np.searchsorted(np.cumsum(self.counts), max(rank, 1)))
+        return min(_bucket_upper(idx), self.max_ns)
+
+    def summary(self):
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_us": self.total_ns / self.count / 1e3,
+            "p50_us": self.percentile(50) / 1e3,
+            "p90_us": self.percentile(90) / 1e3,
+            "p99_us": self.percentile(99) / 1e3,
+            "p999_us": self.percentile(99.9) / 1e3,
+            "max_us": self.max_ns / 1e3,
+        }
+
+    def reset(self):
+        self.counts[:] = 0
+        self.count = self.total_ns = self.max_ns = 0
+
+
+class LatencyRecorder:
+    """
+    Per-stage collection of LatencyHistograms. Callers time a stage with two
+    time.perf_counter_ns() reads and call record(stage, elapsed_ns).
+    """
+    def __init__(self):
+        self.stages = {}
+
+    def record(self, stage, elapsed_ns):
+        hist = self.stages.get(stage)
+        if hist is None:
+            hist = self.stages[stage] = LatencyHistogram()
+        hist.record(elapsed_ns)
+
+    def report(self):
+        return {stage: hist.summary() for stage, hist in self.stages.items()}
+
+    def totals(self, prefix=""):
+        """(calls, total_ns) summed over the stages whose name starts with prefix."""
+        hists = [h for stage, h in self.stages.items() if stage.startswith(prefix)]
+        return sum(h.count for h in hists), sum(h.total_ns for h in hists)
+
+    def reset(self):
+        for hist in self.stages.values():
+            hist.reset()
+
+
+class TimedOrderBook:
+    """
+    Wraps an aegis_lob.OrderBook and times every call made from Python, so the
+    cost of crossing the pybind11 boundary shows up as its own 'book.*' stages.
+    """
+    def __init__(self, book, recorder):
+        self.book = book
+        self.recorder = recorder
+
+    def _timed(self, stage, fn, *args):
+        t0 = time.perf_counter_ns()
+        result = fn(*args)
+        self.recorder.record(stage, time.perf_counter_ns() - t0)
+        return result
+
+    def add_order(self, order):
+        return self._timed("book.add_order", self.book.add_order, order)
+
+    def cancel_order(self, order_id):
+        return self._timed("book.cancel_order", self.book.cancel_order, order_id)
+
+    def cancel_owner(self, owner):
+        return self._timed("book.cancel_owner", self.book.cancel_owner, owner)
+
+    def get_order_quantity(self, order_id):
+        return self._timed("book.get_order_quantity", self.book.get_order_quantity, order_id)
+
+    def get_best_bid(self):
+        return self._timed("book.get_best_bid", self.book.get_best_bid)
+
+    def get_best_ask(self):
+        return self._timed("book.get_best_ask", self.book.get_best_ask)
+
+    def get_mid_price(self):
+        return self._timed("book.get_mid_price", self.book.get_mid_price)
+
+    def get_analytics(self, depth_bps=10.0, fill_qty=1.0):
+        return self._timed("book.get_analytics", self.book.get_analytics, depth_bps, fill_qty)
+
+    def __getattr__(self, name):
+        # Untimed pass-through for anything not wrapped above
+        return getattr(self.book, name)
@@ -0,0 +1,194 @@
+import math
+import time
+import aegis_lob as lob
+
+SIDES = (("bid", lob.Side.BUY), ("ask", lob.Side.SELL))
+
+
+class QuoteManager:
+    def __init__(self, book, tick_size=0.01, price_threshold_ticks=1, size_threshold=0.25,
+                 max_msgs_per_sec=50, lot_size=0.001, clock=time.monotonic, owner=1, first_id=1):
+        """
+        Order-management layer between StoikovBot and aegis_lob.OrderBook.
+        Tracks our live order per side and only cancel/replaces it when the price
+        moves by at least price_threshold_ticks or the size changes by more than
+        size_threshold (relative). A token bucket caps messages per second; pulls
+        (quote price <= 0) always go through so risk exits are never throttled.
+        Alongside, it tracks what a naive cancel-and-resubmit-every-update client
+        would have sent and filled, to report messages saved and fill-rate impact
+        (the latter only for check_fills(); engine fills have no naive counterpart).
+        Our orders carry the non-zero `owner` tag so cancel_all() is one bulk cancel;
+        their ids start at first_id, which must not collide with other flow in the book.
+        """
+        self.book = book
+        self.tick_size = tick_size
+        self.price_threshold = price_threshold_ticks * tick_size
+        self.size_threshold = size_threshold
+        self.max_msgs_per_sec = max_msgs_per_sec
+        self.lot_size = lot_size
+        self.clock = clock
+        self.owner = owner
+
+        self.live = {}      # side key -> (order_id, price, lots)
+        self._naive = {}    # side key -> price the naive client would be resting at
+        self._next_id = first_id
+        self._tokens = float(max_msgs_per_sec)
+        self._last_refill = clock()
+
+        self.updates = 0
+        self.messages = 0
+        self.naive_messages = 0
+        self.kept = 0
+        self.replaced = 0
+        self.throttled = 0
+        self.fills = 0
+        self.naive_fills = 0
+        self.engine_mode = False  # Set by engine_fills(); stats() then omits the naive fill rate
+
+    def _round_price(self, side_key, price):
+        # Bids round down and asks round up, so snapping never tightens the quote
+        steps = price / self.tick_size
+        steps = math.floor(steps + 1e-9) if side_key == "bid" else math.ceil(steps - 1e-9)
+        return round(steps * self.tick_size, 10)
+
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(float(self.max_msgs_per_sec),
+                           self._tokens + (now - self._last_refill) * self.max_msgs_per_sec)
+        self._last_refill = now
+
+    def update(self, bid, ask, qty):
+        """
+        Reconciles our live orders with a new (bid, ask, qty) decision.
+        Returns the number of engine messages actually sent.
+        """
+        self.updates += 1
+        self._refill()
+        qty = float(qty)
+        lots = max(1, int(round(qty / self.lot_size)))
+        sent = 0
+        for side_key, side in SIDES:
+            target = float(bid if side_key == "bid" else ask)
+
+            # Naive baseline: cancel whatever rests, then resubmit unconditionally
+            self.naive_messages += (side_key in self._naive) + (target > 0)
+            if target > 0:
+                self._naive[side_key] = target
+            else:
+                self._naive.pop(side_key, None)
+
+            sent += self._reconcile(side_key, side, target, lots)
+        self.messages += sent
+        return sent
+
+    def _reconcile(self, side_key, side, target, lots):
+        live = self.live.get(side_key)
+        if target <= 0:
+            if live is None:
+                return 0
+            self._cancel(side_key)
+            return 1
+
+        price = self._round_price(side_key, target)
+        if live is not None:
+            _, live_price, live_lots = live
+            if (abs(price - live_price) < self.price_threshold
+                    and abs(lots - live_lots) <= self.size_threshold * live_lots):
+                self.kept += 1
+                return 0
+
+        needed = 1 if live is None else 2
+        if self._tokens < needed:
+            self.throttled += 1
+            return 0
+        self._tokens -= needed
+        if live is not None:
+            self._cancel(side_key)
+            self.replaced += 1
+        oid = self._next_id
+        self._next_id += 1
+        self.book.add_order(lob.Order(oid, price, lots, side, time.time_ns(), self.owner))
+        self.live[side_key] = (oid, price, lots)
+        return needed
+
+    def _cancel(self, side_key):
+        oid = self.live.pop(side_key)[0]
+        self.book.cancel_order(oid)
+
+    def check_fills(self, trade_low, trade_high):
+        """
+        Simulated execution for a bar or tick: a resting bid fills if the market traded
+        (or offered) at or below it, a resting ask if at or above. Returns the
+        [(side, price, qty)] fills of our live orders and removes them; the naive
+        client's hypothetical fills are only counted.
+        """
+        for side_key, price in list(self._naive.items()):
+            if (side_key == "bid" and trade_low <= price) or (side_key == "ask" and trade_high >= price):
+                self.naive_fills += 1
+                del self._naive[side_key]
+
+        fills = []
+        for side_key, side in SIDES:
+            live = self.live.get(side_key)
+            if live is None:
+                continue
+            _, price, lots = live
+            if (side_key == "bid" and trade_low <= price) or (side_key == "ask" and trade_high >= price):
+                self._cancel(side_key)
+                self.fills += 1
+                fills.append((side, price, lots * self.lot_size))
+        return fills
+
+    def engine_fills(self):
+        """
+        Fills taken from the book itself, for when our quotes rest in the same OrderBook
+        as the market flow: each live order's size is compared with what is still resting
+        (get_order_quantity) and the [(side, price, qty)] traded since the last call is
+        returned. Fully filled orders leave the live set. The naive client's fills are
+        only estimated by check_fills(), so stats() drops them once this is used.
+        """
+        self.engine_mode = True
+        fills = []
+        for side_key, side in SIDES:
+            live = self.live.get(side_key)
+            if live is None:
+                continue
+            oid, price, lots = live
+            remaining = self.book.get_order_quantity(oid)
+            if remaining == lots:
+                continue
+            self.fills += 1
+            fills.append((side, price, (lots - remaining) * self.lot_size))
+            if remaining:
+                self.live[side_key] = (oid, price, remaining)
+            else:
+                del self.live[side_key]
+        return fills
+
+    def cancel_all(self):
+        """Pulls every live quote (e.g. when the bot's risk lock trips) with one bulk cancel."""
+        if not self.live:
+            return 0
+        ids, _ = self.book.cancel_owner(self.owner)
+        self.live.clear()
+        self.messages += 1
+        return len(ids)
+
+    def stats(self):
+        saved = self.naive_messages - self.messages
+        stats = {
+            "updates": self.updates,
+            "messages": self.messages,
+            "naive_messages": self.naive_messages,
+            "messages_saved": saved,
+            "messages_saved_pct": 100.0 * saved / self.naive_messages if self.naive_messages else 0.0,
+            "kept": self.kept,
+            "replaced": self.replaced,
+            "throttled": self.throttled,
+            "fills": self.fills,
+            "fill_rate": self.fills / self.updates if self.updates else 0.0,
+        }
+        if not self.engine_mode:
+            stats["naive_fills"] = self.naive_fills
+            stats["naive_fill_rate"] = self.naive_fills / self.updates if self.updates else 0.0
+        return stats
@@ -1,18 +1,57 @@
 import numpy as np
 
 class RiskAnalyzer:
-    def __init__(self):
+    def __init__(self, streaming=False):
+        """
+        streaming=True keeps O(1) running accumulators instead of the full
+        P&L history, so memory stays flat for arbitrarily long backtests.
+        """
+        self.streaming = streaming
         self.pnl_history = []
         self.returns = []
 
+        # Running state for streaming mode (Welford mean/variance)
+        self._last_pnl = None
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._wins = 0
+        self._peak = -np.inf
+        self._max_dd = 0.0
+
     def add_pnl(self, current_pnl):
+        if self.streaming:
+            self._update_running(current_pnl)
+            return
         if len(self.pnl_history) > 0:
-            # Calculate return 
+            # Calculate return
             ret = current_pnl - self.pnl_history[-1]
             self.returns.append(ret)
         self.pnl_history.append(current_pnl)
 
+    def _update_running(self, current_pnl):
+        if self._last_pnl is not None:
+            ret = current_pnl - self._last_pnl
+            self._n += 1
+            delta = ret - self._mean
+            self._mean += delta / self._n
+            self._m2 += delta * (ret - self._mean)
+            if ret > 0: self._wins += 1
+        self._last_pnl = current_pnl
+        if current_pnl > self._peak: self._peak = current_pnl
+        if self._peak - current_pnl > self._max_dd: self._max_dd = self._peak - current_pnl
+
     def calculate_metrics(self):
+        if self.streaming:
+            if self._n == 0:
+                return {}
+            return {
+                "total_pnl": self._last_pnl,
+                "sharpe_ratio": self._mean / (np.sqrt(self._m2 / self._n) + 1e-8),
+                "max_drawdown": self._max_dd,
+                "win_rate": self._wins / self._n
+            }
+
         if not self.returns:
             return {}
 
@@ -39,4 +78,4 @@ class RiskAnalyzer:
             "sharpe_ratio": sharpe,
             "max_drawdown": max_drawdown,
             "win_rate": win_rate
-        }
\ No newline at end of file
+        }
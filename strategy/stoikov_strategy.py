@@ -5,10 +5,10 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
 if project_root not in sys.path:
     sys.path.append(project_root)
+import time
 import numpy as np
-import torch
 import aegis_lob as lob
-from strategy.ai_model import PricePredictorLSTM
+from strategy.latency import LatencyRecorder
 
 
 
@@ -42,16 +42,51 @@ class StoikovBot:
         # --- Signal Modules ---
         self.base_alpha_weight = 0.8
         self.last_ai_adj = 0.0
+        self.imbalance_weight = 0.5      # Reservation shift per unit of L1 imbalance, in half-spreads
+        self.last_imbalance = 0.0
         
         # --- MOON SHIELD PARAMETERS ---
         self.momentum_threshold = 0.0015 # Vertical rally detection (0.15% move)
         
-        # --- AI Engine Initialization ---
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model = PricePredictorLSTM().to(self.device)
-        self.model.eval()
+        # --- AI Engine (built on first inference, so precomputed-feature runs never import torch) ---
+        self.device = None
+        self.model = None
+        self.weights_path = None         # None: feature_cache.default_weights_path()
         self.price_history = []
 
+        # --- Precomputed Feature Mode (see strategy/feature_cache.py) ---
+        self.features = None
+        self.bar_index = 0
+
+        # --- Hot-Path Instrumentation (see strategy/latency.py) ---
+        self.latency = None
+
+    def use_precomputed_features(self, features):
+        """
+        Reads the AI signal and rolling volatility by bar index instead of running
+        inference. Each calculate_quotes() call consumes the next bar, so the bot must
+        be driven over the same price series the features were computed from.
+        """
+        self.features = features
+        self.bar_index = 0
+
+    def enable_latency_tracking(self, recorder=None):
+        """
+        Times each quoting stage with perf_counter_ns into fixed-bucket histograms.
+        Disabled (the default) it costs one attribute check per stage.
+        """
+        self.latency = recorder or LatencyRecorder()
+        return self.latency
+
+    def get_latency_report(self):
+        """Per-stage latency summary (count, mean and percentiles in microseconds)."""
+        return self.latency.report() if self.latency is not None else {}
+
+    def _lap(self, stage, t_start):
+        now = time.perf_counter_ns()
+        self.latency.record(stage, now - t_start)
+        return now
+
     def _calculate_kelly_qty(self, mid_price):
         """Calculates dynamic order size based on Kelly Criterion."""
         p = self.win_rate
@@ -63,7 +98,11 @@ class StoikovBot:
         return np.clip(target_qty, 0.005, self.max_inventory)
 
     def calculate_quotes(self, mid_price, best_bid_qty, best_ask_qty):
+        bar = self.bar_index
+        self.bar_index += 1
         if self.is_stopped: return 0.0, 0.0, 0.0
+        lat = self.latency
+        if lat is not None: t0 = t = time.perf_counter_ns()
         self.price_history.append(mid_price)
         if len(self.price_history) > 100: self.price_history.pop(0)
 
@@ -78,28 +117,50 @@ class StoikovBot:
                 self.is_stopped = True
                 return 0.0, 0.0, 0.0
 
+        if lat is not None: t = self._lap("risk", t)
+
         # 2. DYNAMIC POSITION SIZING
         order_qty = self._calculate_kelly_qty(mid_price)
+        if lat is not None: t = self._lap("kelly", t)
 
         # 3. ALPHA SIGNAL AND TREND ANALYSIS
-        raw_ai_signal = self._get_ai_signal(mid_price)
+        if self.features is not None:
+            raw_ai_signal = self.features['ai_signal'][bar] * self.base_alpha_weight
+        else:
+            raw_ai_signal = self._get_ai_signal(mid_price)
+        if lat is not None: t = self._lap("signal", t)
         trend_strength = raw_ai_signal / mid_price 
         inv_ratio = self.inventory / self.max_inventory
         
         bid_bias, ask_bias = 1.0, 1.0
         
         # 4. SPREAD CALCULATION
-        market_vol = np.std(self.price_history[-30:]) / mid_price if len(self.price_history) > 30 else self.sigma
+        if self.features is not None:
+            market_vol = self.features['market_vol'][bar]
+            if np.isnan(market_vol): market_vol = self.sigma
+        else:
+            market_vol = np.std(self.price_history[-30:]) / mid_price if len(self.price_history) > 30 else self.sigma
         vol_multiplier = np.clip(market_vol / 0.0002, 1.0, 6.0)
         min_barrier = mid_price * self.comm_rate * 4.0 
         base_spread = (2 / self.base_gamma) * np.log(1 + self.base_gamma / self.k)
         final_spread = max(base_spread, min_barrier) * vol_multiplier
+        if lat is not None: t = self._lap("volatility", t)
+
+        # Lean toward the heavier side of the book (0 with the flat 1.0/1.0 quantities of OHLCV
+        # backtests). Applied in every regime, including the moon branch's lone bid.
+        touch_qty = best_bid_qty + best_ask_qty
+        book_imbalance = (best_bid_qty - best_ask_qty) / touch_qty if touch_qty > 0 else 0.0
+        self.last_imbalance = book_imbalance
+        imbalance_shift = book_imbalance * self.imbalance_weight * (final_spread / 2)
 
         # 5. MOON & CRASH SHIELD LOGIC
         if trend_strength > self.momentum_threshold: # AGGRESSIVE MOON (Vertical Rally)
             # CEASE-FIRE: Halt all sell orders to prevent short-squeezing
             my_ask = 0.0 
-            my_bid = mid_price - (final_spread * 2.0) # Move bid significantly lower
+            my_bid = mid_price - (final_spread * 2.0) + imbalance_shift # Move bid significantly lower
+            if lat is not None:
+                self._lap("regime", t)
+                self._lap("total", t0)
             return my_bid, my_ask, order_qty
 
         elif trend_strength > 0.0005: # MODERATE MOON
@@ -113,12 +174,16 @@ class StoikovBot:
             reservation_price = mid_price - (self.inventory * dynamic_gamma * (self.sigma**2)) + (raw_ai_signal * 0.8)
 
         # 6. FINAL QUOTE GENERATION
+        reservation_price += imbalance_shift
         my_bid = reservation_price - (final_spread / 2) * bid_bias
         my_ask = reservation_price + (final_spread / 2) * ask_bias
 
         # Inventory Cap Enforcement
         if self.inventory >= self.max_inventory * 0.95: my_bid = 0.0
         if self.inventory <= -self.max_inventory * 0.95: my_ask = 0.0
+        if lat is not None:
+            self._lap("regime", t)
+            self._lap("total", t0)
 
         return my_bid, my_ask, order_qty
 
@@ -135,9 +200,32 @@ class StoikovBot:
             self.inventory -= qty
             self.cash += (val - fee)
 
+    def load_model(self):
+        """
+        Imports torch, loads the LSTM and runs one dummy forward pass now, so the
+        first live quote does not pay for any of it. Live runtimes call this before
+        their first tick; otherwise it happens lazily on the first AI signal.
+        """
+        if self.model is None:
+            self._load_model()
+            with self._torch.no_grad():
+                self.model(self._torch.zeros(1, 50, 1, device=self.device))
+        return self
+
+    def _load_model(self):
+        # Same weights (or seeded init) as feature_cache, so per-bar and precomputed
+        # signals come from one network
+        import torch
+        from strategy.feature_cache import load_signal_model
+        self._torch = torch
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.model = load_signal_model(self.weights_path, self.device)
+
     def _get_ai_signal(self, mid_price):
         """Fetches trend signal from LSTM model."""
         if len(self.price_history) < 50: return 0.0
+        if self.model is None: self._load_model()
+        torch = self._torch
         recent = np.array(self.price_history[-50:]).reshape(-1, 1)
         p_min, p_max = np.min(recent), np.max(recent)
         scaled = (recent - p_min) / (p_max - p_min + 1e-8)
@@ -0,0 +1,118 @@
+import sys
+import os
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.historical_downloader import HistoricalDownloader, SyntheticExchange, missing_ranges
+
+TF_MS = 60_000
+DAY_1 = "2024-09-15T00:00:00Z"
+DAY_2 = "2024-09-16T00:00:00Z"
+DAY_3 = "2024-09-17T00:00:00Z"
+
+
+def make_downloader(tmp_path, exchange=None, max_retries=5):
+    # 200-candle segments of two 100-candle pages; one worker keeps request order fixed
+    return HistoricalDownloader(exchange or SyntheticExchange(), data_dir=str(tmp_path), max_workers=1,
+                                segment_candles=200, page_limit=100, max_retries=max_retries)
+
+
+def expected_timestamps(start, end):
+    ex = SyntheticExchange()
+    return np.arange(ex.parse8601(start), ex.parse8601(end), TF_MS)
+
+
+def read_target(tmp_path, name="bt.csv"):
+    return pd.read_csv(os.path.join(tmp_path, name))
+
+
+# --- missing_ranges ---
+
+def test_missing_ranges_empty_file_needs_whole_window():
+    assert missing_ranges(np.empty(0, dtype=np.int64), 0, 10 * TF_MS, TF_MS) == [(0, 10 * TF_MS)]
+
+
+def test_missing_ranges_full_coverage_needs_nothing():
+    have = np.arange(0, 10 * TF_MS, TF_MS)
+    assert missing_ranges(have, 0, 10 * TF_MS, TF_MS) == []
+
+
+def test_missing_ranges_head_gap_and_tail():
+    have = np.arange(3 * TF_MS, 6 * TF_MS, TF_MS)
+    assert missing_ranges(have, 0, 10 * TF_MS, TF_MS) == [(0, 3 * TF_MS), (6 * TF_MS, 10 * TF_MS)]
+
+
+def test_missing_ranges_internal_gap():
+    have = np.array([0, 1, 2, 6, 7, 8, 9]) * TF_MS
+    assert missing_ranges(have, 0, 10 * TF_MS, TF_MS) == [(3 * TF_MS, 6 * TF_MS)]
+
+
+def test_missing_ranges_ignores_candles_outside_window():
+    have = np.array([-5, -4, 20, 21]) * TF_MS
+    assert missing_ranges(have, 0, 10 * TF_MS, TF_MS) == [(0, 10 * TF_MS)]
+
+
+# --- HistoricalDownloader against SyntheticExchange ---
+
+def test_initial_fetch_covers_window_despite_flaky_exchange(tmp_path, monkeypatch):
+    monkeypatch.setattr("scripts.historical_downloader.time.sleep", lambda s: None)
+    exchange = SyntheticExchange(fail_every=4)
+    make_downloader(tmp_path, exchange).download("BTC/USDT", "1m", DAY_1, DAY_2, "bt.csv")
+    df = read_target(tmp_path)
+    np.testing.assert_array_equal(df["timestamp"].to_numpy(), expected_timestamps(DAY_1, DAY_2))
+    assert list(df.columns[-2:]) == ["bid_qty", "ask_qty"]
+    assert not os.path.exists(os.path.join(tmp_path, ".partial", "bt.csv"))
+
+
+def test_interrupted_run_resumes_from_staged_segments(tmp_path):
+    full = SyntheticExchange()
+    make_downloader(tmp_path / "ref", full).download("BTC/USDT", "1m", DAY_1, DAY_2, "bt.csv")
+
+    # No retries: the 5th request aborts the run after two segments were staged
+    with pytest.raises(ConnectionError):
+        make_downloader(tmp_path, SyntheticExchange(fail_every=5), max_retries=1).download(
+            "BTC/USDT", "1m", DAY_1, DAY_2, "bt.csv")
+    assert not os.path.exists(os.path.join(tmp_path, "bt.csv"))
+
+    resumed = SyntheticExchange()
+    make_downloader(tmp_path, resumed).download("BTC/USDT", "1m", DAY_1, DAY_2, "bt.csv")
+    assert 0 < resumed.requests < full.requests
+    pd.testing.assert_frame_equal(read_target(tmp_path), read_target(tmp_path / "ref"))
+
+
+def test_tail_extension_appends_only_new_candles(tmp_path):
+    make_downloader(tmp_path).download("BTC/USDT", "1m", DAY_1, DAY_2, "bt.csv")
+    exchange = SyntheticExchange()
+    make_downloader(tmp_path, exchange).download("BTC/USDT", "1m", DAY_1, DAY_3, "bt.csv")
+    make_downloader(tmp_path / "ref").download("BTC/USDT", "1m", DAY_1, DAY_3, "bt.csv")
+    # One day of 1m candles = 8 segments: 7 full (2 pages) + 1 short (1 page)
+    assert exchange.requests == 15
+    pd.testing.assert_frame_equal(read_target(tmp_path), read_target(tmp_path / "ref"))
+
+
+def test_backfill_rewrites_in_timestamp_order(tmp_path):
+    make_downloader(tmp_path).download("BTC/USDT", "1m", DAY_2, DAY_3, "bt.csv")
+    make_downloader(tmp_path).download("BTC/USDT", "1m", DAY_1, DAY_3, "bt.csv")
+    make_downloader(tmp_path / "ref").download("BTC/USDT", "1m", DAY_1, DAY_3, "bt.csv")
+    pd.testing.assert_frame_equal(read_target(tmp_path), read_target(tmp_path / "ref"))
+
+
+def test_rerun_is_idempotent(tmp_path):
+    make_downloader(tmp_path).download("BTC/USDT", "1m", DAY_1, DAY_2, "bt.csv")
+    before = read_target(tmp_path)
+    exchange = SyntheticExchange()
+    make_downloader(tmp_path, exchange).download("BTC/USDT", "1m", DAY_1, DAY_2, "bt.csv")
+    assert exchange.requests == 0
+    pd.testing.assert_frame_equal(read_target(tmp_path), before)
+
+
+def test_staged_segments_from_another_window_are_not_merged(tmp_path):
+    with pytest.raises(ConnectionError):
+        make_downloader(tmp_path, SyntheticExchange(fail_every=5), max_retries=1).download(
+            "BTC/USDT", "1m", DAY_2, DAY_3, "bt.csv")
+    make_downloader(tmp_path).download("BTC/USDT", "1m", DAY_1, DAY_2, "bt.csv")
+    np.testing.assert_array_equal(read_target(tmp_path)["timestamp"].to_numpy(), expected_timestamps(DAY_1, DAY_2))
@@ -0,0 +1,85 @@
+import sys
+import os
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+import numpy as np
+import pytest
+from shm_bus import MarketDataRing, RingReader
+
+
+class _LapDuringCopy(np.ndarray):
+    """Records view that runs `on_copy(copy)` right after the reader's bulk copy."""
+    on_copy = None
+
+    def __getitem__(self, key):
+        out = super().__getitem__(key)
+        hook = type(self).on_copy
+        if hook is not None and isinstance(key, np.ndarray):
+            type(self).on_copy = None
+            hook(np.asarray(out))
+        return np.asarray(out)
+
+
+@pytest.fixture
+def ring():
+    ring = MarketDataRing.create(n_symbols=1, capacity=8)
+    yield ring
+    ring.close()
+
+
+def publish_seq(ring, start, n):
+    # Payload derived from seq so a torn record is detectable
+    seqs = np.arange(start, start + n)
+    ring.publish(symbol=np.zeros(n, dtype=np.int32), ts_ns=seqs, mid=seqs * 1.0)
+
+
+def test_poll_returns_published_records(ring):
+    publish_seq(ring, 0, 5)
+    out = RingReader(ring).poll()
+    assert out["seq"].tolist() == list(range(5))
+    assert (out["mid"] == out["seq"]).all()
+
+
+def test_lap_during_copy_discards_torn_records(ring):
+    cap = ring.capacity
+    publish_seq(ring, 0, cap)
+    reader = RingReader(ring)
+    torn = 3
+
+    def producer_laps_mid_copy(copy):
+        # The producer starts the next lap on the first `torn` slots after the reader
+        # read their (old) seq but before it read their payload: the copy is half new.
+        slots = np.arange(torn)
+        ring.records["seq"][slots] = -1
+        ring.records["mid"][slots] = -1.0
+        copy["mid"][:torn] = -1.0
+
+    records = ring.records
+    ring.records = records.view(_LapDuringCopy)
+    _LapDuringCopy.on_copy = producer_laps_mid_copy
+    try:
+        out = reader.poll()
+    finally:
+        _LapDuringCopy.on_copy = None
+        ring.records = records
+
+    assert out["seq"].tolist() == list(range(torn, cap))
+    assert (out["mid"] == out["seq"]).all()
+    assert reader.overruns == torn
+
+    # Once the producer finishes the lap the reader carries on from where it was
+    publish_seq(ring, cap, torn)
+    out = reader.poll()
+    assert out["seq"].tolist() == list(range(cap, cap + torn))
+    assert (out["mid"] == out["seq"]).all()
+
+
+def test_reader_far_behind_skips_to_oldest(ring):
+    cap = ring.capacity
+    reader = RingReader(ring)
+    publish_seq(ring, 0, 3 * cap)
+    out = reader.poll()
+    assert out["seq"].tolist() == list(range(2 * cap, 3 * cap))
+    assert reader.overruns == 2 * cap
@@ -1,22 +1,193 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <pybind11/numpy.h>
+#include <stdexcept>
 #include "../core/include/OrderBook.hpp"
+#include "../core/include/LevelBook.hpp"
 
 namespace py = pybind11;
 
+// Threading contract: OrderBook and LevelBook have no internal lock, so every
+// binding below (batch calls included) runs with the GIL held. A book can then
+// be shared between Python threads like any other Python object; releasing the
+// GIL in a mutating call would let another thread touch the book mid-update.
+
+template <typename T>
+using CArray = py::array_t<T, py::array::c_style | py::array::forcecast>;
+
+// Applies a whole batch of L2 updates in one call. The arrays are converted once
+// and the whole loop runs in C++.
+static size_t applyLevelUpdates(LevelBook& book, CArray<int8_t> sides, CArray<double> prices, CArray<double> qtys) {
+    size_t n = static_cast<size_t>(sides.size());
+    if (sides.ndim() != 1 || static_cast<size_t>(prices.size()) != n || static_cast<size_t>(qtys.size()) != n) {
+        throw std::invalid_argument("apply_updates: sides, prices and qtys must be 1-D arrays of equal length");
+    }
+    const int8_t* s = sides.data();
+    const double* p = prices.data();
+    const double* q = qtys.data();
+    book.applyUpdates(s, p, q, n);
+    return n;
+}
+
+// Replays a mixed add / cancel / market event stream (see scripts/hawkes_generator.py)
+// in one call. Returns the total executed quantity.
+static uint64_t applyBookEvents(OrderBook& book, CArray<int8_t> kinds, CArray<int8_t> sides, CArray<uint64_t> ids,
+                                CArray<double> prices, CArray<uint32_t> qtys, CArray<int64_t> timestamps) {
+    size_t n = static_cast<size_t>(kinds.size());
+    for (py::ssize_t size : {sides.size(), ids.size(), prices.size(), qtys.size(), timestamps.size()}) {
+        if (static_cast<size_t>(size) != n) {
+            throw std::invalid_argument("apply_events: all event arrays must have equal length");
+        }
+    }
+    const int8_t* k = kinds.data();
+    const int8_t* s = sides.data();
+    const uint64_t* id = ids.data();
+    const double* p = prices.data();
+    const uint32_t* q = qtys.data();
+    const int64_t* ts = timestamps.data();
+    return book.applyEvents(k, s, id, p, q, ts, n);
+}
+
+// Runs one of the OrderBook bulk cancels and hands back (ids, quantities)
+// as NumPy arrays instead of a list of Python ints.
+template <typename Cancel>
+static py::tuple bulkCancel(Cancel cancel) {
+    CancelResult result = cancel();
+    py::array_t<uint64_t> ids(result.ids.size(), result.ids.data());
+    py::array_t<uint32_t> qtys(result.quantities.size(), result.quantities.data());
+    return py::make_tuple(ids, qtys);
+}
+
 PYBIND11_MODULE(aegis_lob, m) {
     py::enum_<Side>(m, "Side")
         .value("BUY", Side::BUY)
         .value("SELL", Side::SELL);
 
     py::class_<Order>(m, "Order")
-        .def(py::init<uint64_t, double, uint32_t, Side, uint64_t>());
+        .def(py::init<uint64_t, double, uint32_t, Side, uint64_t>())
+        .def(py::init<uint64_t, double, uint32_t, Side, uint64_t, uint32_t>(), py::arg("id"), py::arg("price"),
+             py::arg("quantity"), py::arg("side"), py::arg("timestamp"), py::arg("owner"),
+             "owner: non-zero tag that OrderBook.cancel_owner() can sweep in one call.");
+
+    py::class_<BookAnalytics>(m, "BookAnalytics")
+        .def_readonly("best_bid", &BookAnalytics::bestBid)
+        .def_readonly("best_ask", &BookAnalytics::bestAsk)
+        .def_readonly("best_bid_qty", &BookAnalytics::bestBidQty)
+        .def_readonly("best_ask_qty", &BookAnalytics::bestAskQty)
+        .def_readonly("mid", &BookAnalytics::mid)
+        .def_readonly("spread", &BookAnalytics::spread)
+        .def_readonly("imbalance", &BookAnalytics::imbalance)
+        .def_readonly("microprice", &BookAnalytics::microprice)
+        .def_readonly("bid_depth", &BookAnalytics::bidDepth)
+        .def_readonly("ask_depth", &BookAnalytics::askDepth)
+        .def_readonly("depth_imbalance", &BookAnalytics::depthImbalance)
+        .def_readonly("depth_weighted_mid", &BookAnalytics::depthWeightedMid)
+        .def_readonly("vwap_buy", &BookAnalytics::vwapBuy)
+        .def_readonly("vwap_sell", &BookAnalytics::vwapSell)
+        .def_readonly("total_bid_volume", &BookAnalytics::totalBidVolume)
+        .def_readonly("total_ask_volume", &BookAnalytics::totalAskVolume)
+        .def_readonly("bid_levels", &BookAnalytics::bidLevels)
+        .def_readonly("ask_levels", &BookAnalytics::askLevels);
+
+    py::class_<OpCycleStats>(m, "OpCycleStats")
+        .def_readonly("samples", &OpCycleStats::samples)
+        .def_readonly("total", &OpCycleStats::total)
+        .def_readonly("max", &OpCycleStats::max)
+        .def_property_readonly("mean", &OpCycleStats::mean);
+
+// BookStats fields, listed once for both the attributes and to_dict()
+#define AEGIS_BOOK_COUNTERS(X) \
+    X("adds_received", addsReceived) \
+    X("orders_rested", ordersRested) \
+    X("market_orders", marketOrders) \
+    X("cancels_requested", cancelsRequested) \
+    X("cancels_unknown", cancelsUnknown) \
+    X("bulk_cancels", bulkCancels) \
+    X("orders_bulk_cancelled", ordersBulkCancelled) \
+    X("matches", matches) \
+    X("matched_volume", matchedVolume) \
+    X("levels_created", levelsCreated) \
+    X("levels_erased", levelsErased) \
+    X("bid_levels", bidLevels) \
+    X("ask_levels", askLevels) \
+    X("resting_orders", restingOrders) \
+    X("peak_resting_orders", peakRestingOrders) \
+    X("order_map_size", orderMapSize) \
+    X("order_map_buckets", orderMapBuckets) \
+    X("order_price_map_size", orderPriceMapSize) \
+    X("order_price_map_buckets", orderPriceMapBuckets) \
+    X("estimated_bytes", estimatedBytes) \
+    X("sample_every", sampleEvery) \
+    X("cycles_are_tsc", cyclesAreTsc)
+#define AEGIS_BOOK_CYCLE_STATS(X) \
+    X("add_cycles", addCycles) \
+    X("cancel_cycles", cancelCycles) \
+    X("market_cycles", marketCycles)
+
+#define AEGIS_STAT(name, field) .def_readonly(name, &BookStats::field)
+#define AEGIS_STAT_ITEM(name, field) d[name] = st.field;
+#define AEGIS_CYCLE_ITEM(name, field) \
+    d[name] = py::dict(py::arg("samples") = st.field.samples, py::arg("total") = st.field.total, \
+                       py::arg("max") = st.field.max, py::arg("mean") = st.field.mean());
+    py::class_<BookStats>(m, "BookStats")
+        AEGIS_BOOK_COUNTERS(AEGIS_STAT)
+        AEGIS_BOOK_CYCLE_STATS(AEGIS_STAT)
+        .def("to_dict", [](const BookStats& st) {
+            py::dict d;
+            AEGIS_BOOK_COUNTERS(AEGIS_STAT_ITEM)
+            AEGIS_BOOK_CYCLE_STATS(AEGIS_CYCLE_ITEM)
+            return d;
+        }, "Plain dict of every counter and gauge (cycle stats as nested dicts).");
+#undef AEGIS_CYCLE_ITEM
+#undef AEGIS_STAT_ITEM
+#undef AEGIS_STAT
+#undef AEGIS_BOOK_CYCLE_STATS
+#undef AEGIS_BOOK_COUNTERS
 
     py::class_<OrderBook>(m, "OrderBook")
         .def(py::init<>())
         .def("add_order", &OrderBook::addOrder)
         .def("cancel_order", &OrderBook::cancelOrder)
+        .def("market_order", &OrderBook::marketOrder, py::arg("order_id"), py::arg("side"), py::arg("qty"),
+             py::arg("timestamp") = 0, "IOC market order; returns the executed quantity.")
+        .def("apply_events", &applyBookEvents, py::arg("kinds"), py::arg("sides"), py::arg("ids"),
+             py::arg("prices"), py::arg("qtys"), py::arg("timestamps"))
+        .def("cancel_side", [](OrderBook& book, Side side) {
+            return bulkCancel([&]() { return book.cancelSide(side); });
+        }, py::arg("side"), "Cancels every resting order on one side; returns (ids, qtys) arrays.")
+        .def("cancel_range", [](OrderBook& book, Side side, double minPrice, double maxPrice) {
+            return bulkCancel([&]() { return book.cancelRange(side, minPrice, maxPrice); });
+        }, py::arg("side"), py::arg("min_price"), py::arg("max_price"),
+           "Cancels resting orders on one side priced in [min_price, max_price]; returns (ids, qtys) arrays.")
+        .def("cancel_owner", [](OrderBook& book, uint32_t owner) {
+            return bulkCancel([&]() { return book.cancelOwner(owner); });
+        }, py::arg("owner"), "Cancels every resting order with this owner tag; returns (ids, qtys) arrays.")
+        .def("set_logging", &OrderBook::setLogging, py::arg("enabled"))
+        .def("get_stats", &OrderBook::getStats)
+        .def("reset_stats", &OrderBook::resetStats)
+        .def("set_cycle_sampling", &OrderBook::setCycleSampling, py::arg("every"),
+             "Time one of every N add / cancel / market operations (0 disables).")
         .def("get_best_bid", &OrderBook::getBestBid)
         .def("get_best_ask", &OrderBook::getBestAsk)
-        .def("get_mid_price", &OrderBook::getMidPrice);
+        .def("get_mid_price", &OrderBook::getMidPrice)
+        .def("get_order_quantity", &OrderBook::getOrderQuantity, py::arg("order_id"),
+             "Remaining resting quantity of an order (0 if filled, cancelled or unknown).")
+        .def("get_depth", &OrderBook::getDepth, py::arg("side"), py::arg("levels") = 10)
+        .def("get_analytics", &OrderBook::getAnalytics, py::arg("depth_bps") = 10.0, py::arg("fill_qty") = 1.0);
+
+    py::class_<LevelBook>(m, "LevelBook")
+        .def(py::init<>())
+        .def("set_level", &LevelBook::setLevel, py::arg("side"), py::arg("price"), py::arg("qty"))
+        .def("apply_updates", &applyLevelUpdates, py::arg("sides"), py::arg("prices"), py::arg("qtys"),
+             "Batched set_level. sides: int8 array (0 = BUY, 1 = SELL); qty <= 0 removes the level.")
+        .def("clear", &LevelBook::clear)
+        .def("get_best_bid", &LevelBook::getBestBid)
+        .def("get_best_ask", &LevelBook::getBestAsk)
+        .def("get_best_bid_qty", &LevelBook::getBestBidQty)
+        .def("get_best_ask_qty", &LevelBook::getBestAskQty)
+        .def("get_mid_price", &LevelBook::getMidPrice)
+        .def("get_depth", &LevelBook::getDepth, py::arg("side"), py::arg("levels") = 10)
+        .def("get_analytics", &LevelBook::getAnalytics, py::arg("depth_bps") = 10.0, py::arg("fill_qty") = 1.0)
+        .def("level_count", &LevelBook::levelCount)
+        .def_property_readonly("update_count", &LevelBook::getUpdateCount);
 }
\ No newline at end of file